@@ -0,0 +1,222 @@
+"""
+banco.py
+Banco de triángulos precalculados en un archivo binario que se abre con mmap:
+abrirlo solo lee la cabecera (no depende del tamaño del banco) y cada sorteo
+lee un registro de 56 bytes directo del mapa, sin parsear ni copiar el archivo.
+
+Formato:
+    cabecera (256 bytes): "TRIBANCO" | versión u32 | tamaño de registro u32 |
+        (inicio u64, cantidad u64) por cada (tipo, dificultad), en orden de TIPOS y NIVELES
+    registros: a, b, c, A, B, C (6 doubles) | tipo u8 | dificultad u8 | 6 bytes de relleno
+Los registros están agrupados por tipo y dentro de cada tipo por dificultad, así
+que sortear un "agudo" (o un "agudo" difícil) es elegir un índice en su tramo.
+
+Uso:
+    python banco.py construir -n 1000000 --seed 1 -o banco.bin
+    python banco.py construir -n 1000000 --tipo agudo --ssa unica -o unicos.bin
+    python banco.py info banco.bin
+"""
+
+import argparse, mmap, os, random, shutil, struct, sys, tempfile
+
+from compacto import Triangulo
+from resolver import filtro_ssa
+from triangulos import CLAVES, TIPOS, generar_triangulo, generar_triangulos
+
+MAGIA = b"TRIBANCO"
+VERSION = 1
+NIVELES = ("facil", "media", "dificil")
+REGISTRO = struct.Struct("<6dBB6x")            # 56 bytes
+TRAMO = struct.Struct("<QQ")
+CABECERA = struct.Struct("<8sII")
+TAMANO_CABECERA = 256
+BLOQUE = 10_000
+VARIABLE = "TRIANGULOS_BANCO"
+
+def dificultad(A, B, C):
+    # el ángulo más chico manda: los triángulos muy finos son más difíciles de resolver
+    m = min(A, B, C)
+    return 0 if m >= 30 else 1 if m >= 15 else 2
+
+# --------------------------
+# Construir
+# --------------------------
+def construir(ruta, por_tipo, scale=1.0, rng=None, bloque=BLOQUE, filtro=None, avance=None):
+    # por_tipo: {"agudo": 100000, ...}; se escribe por bloques en un temporal por
+    # dificultad y después se concatenan, así la memoria no crece con el banco.
+    # filtro(cols) -> cols deja solo algunos triángulos (p. ej. resolver.filtro_ssa);
+    # avance(hechos, total) se llama después de cada bloque (ver trabajos.py)
+    rng = rng or random.Random()
+    total = sum(por_tipo.values())
+    tramos = {}
+    with open(ruta, "wb") as salida:
+        salida.write(bytes(TAMANO_CABECERA))
+        inicio = 0
+        for i_tipo, tipo in enumerate(TIPOS):
+            n = por_tipo.get(tipo, 0)
+            cubos = [tempfile.TemporaryFile() for _ in NIVELES]
+            cuantos = [0] * len(NIVELES)
+            hechos = 0
+            while hechos < n:
+                m = min(bloque, n - hechos)
+                if filtro is None:
+                    cols = generar_triangulos(m, tipo, scale, rng)
+                else:
+                    cols = filtro(generar_triangulos(bloque, tipo, scale, rng))
+                    if not cols['a']:
+                        raise ValueError(f"el filtro no deja ningún triángulo '{tipo}'")
+                    cols = {k: v[:m] for k, v in cols.items()}
+                    m = len(cols['a'])
+                partes = [bytearray() for _ in NIVELES]
+                for fila in zip(*(cols[k] for k in CLAVES)):
+                    nivel = dificultad(fila[3], fila[4], fila[5])
+                    partes[nivel] += REGISTRO.pack(*fila, i_tipo, nivel)
+                    cuantos[nivel] += 1
+                for cubo, parte in zip(cubos, partes):
+                    cubo.write(parte)
+                hechos += m
+                if avance is not None:
+                    avance(inicio + sum(cuantos), total)
+            for nivel, cubo in enumerate(cubos):
+                cubo.seek(0)
+                shutil.copyfileobj(cubo, salida)
+                cubo.close()
+                tramos[tipo, nivel] = (inicio, cuantos[nivel])
+                inicio += cuantos[nivel]
+
+        cabecera = bytearray(CABECERA.pack(MAGIA, VERSION, REGISTRO.size))
+        for tipo in TIPOS:
+            for nivel in range(len(NIVELES)):
+                cabecera += TRAMO.pack(*tramos[tipo, nivel])
+        salida.seek(0)
+        salida.write(cabecera)
+    return inicio
+
+# --------------------------
+# Leer
+# --------------------------
+class Banco:
+    def __init__(self, ruta):
+        self._archivo = open(ruta, "rb")
+        try:
+            self._mm = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._archivo.close()
+            raise ValueError(f"{ruta}: banco vacío")
+        magia, version, tam = CABECERA.unpack_from(self._mm, 0)
+        if magia != MAGIA or version != VERSION or tam != REGISTRO.size:
+            self.cerrar()
+            raise ValueError(f"{ruta}: no es un banco de triángulos v{VERSION}")
+        self.tramos = {}
+        o = CABECERA.size
+        for tipo in TIPOS:
+            for nivel in range(len(NIVELES)):
+                self.tramos[tipo, nivel] = TRAMO.unpack_from(self._mm, o)
+                o += TRAMO.size
+        # por tipo, todas las dificultades juntas: son tramos contiguos
+        self.por_tipo = {}
+        for tipo in TIPOS:
+            inicio = self.tramos[tipo, 0][0]
+            self.por_tipo[tipo] = (inicio, sum(self.tramos[tipo, n][1] for n in range(len(NIVELES))))
+
+    def __len__(self):
+        return (len(self._mm) - TAMANO_CABECERA) // REGISTRO.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        self._mm.close()
+        self._archivo.close()
+
+    def registro(self, i):
+        # devuelve (Triangulo, tipo, dificultad) del registro i
+        *medidas, i_tipo, nivel = REGISTRO.unpack_from(self._mm, TAMANO_CABECERA + i * REGISTRO.size)
+        return Triangulo(*medidas), TIPOS[i_tipo], nivel
+
+    def cantidad(self, tipo, dificultad=None):
+        return (self.por_tipo[tipo] if dificultad is None else self.tramos[tipo, dificultad])[1]
+
+    def tipos(self):
+        # los tipos que tienen triángulos (un banco puede construirse con --tipo)
+        return [tipo for tipo in TIPOS if self.por_tipo[tipo][1]]
+
+    def _indice(self, tipo, dificultad, u):
+        inicio, n = self.por_tipo[tipo] if dificultad is None else self.tramos[tipo, dificultad]
+        if n == 0:
+            raise ValueError(f"el banco no tiene triángulos '{tipo}'"
+                             + ("" if dificultad is None else f" de dificultad {NIVELES[dificultad]}"))
+        return inicio + int(u() * n)
+
+    def sortear(self, tipo="aleatorio", rng=None, dificultad=None):
+        # mismo uso que generar_triangulo(tipo, rng=rng); O(1)
+        rng = rng or random
+        i = self._indice(tipo, dificultad, rng.random)
+        return Triangulo(*REGISTRO.unpack_from(self._mm, TAMANO_CABECERA + i * REGISTRO.size)[:6])
+
+    def sortear_lote(self, n, tipo="aleatorio", rng=None, dificultad=None):
+        # columnas como generar_triangulos
+        rng = rng or random
+        u, leer, mm = rng.random, REGISTRO.unpack_from, self._mm
+        filas = [leer(mm, TAMANO_CABECERA + self._indice(tipo, dificultad, u) * REGISTRO.size)
+                 for _ in range(n)]
+        return {k: [f[j] for f in filas] for j, k in enumerate(CLAVES)}
+
+    def generador(self):
+        # generar(tipo, rng=...) para las apps: sortea los tipos que el banco tiene y
+        # genera en el momento los que no, en vez de fallar con ValueError
+        tiene = set(self.tipos())
+        def generar(tipo="aleatorio", rng=None):
+            return self.sortear(tipo, rng) if tipo in tiene else generar_triangulo(tipo, rng=rng)
+        return generar
+
+def banco_desde_entorno():
+    # TRIANGULOS_BANCO=ruta: las apps sacan los triángulos de ese banco
+    ruta = os.environ.get(VARIABLE)
+    if not ruta:
+        return None
+    banco = Banco(ruta)
+    if not banco.tipos():
+        print(f"banco.py: {ruta} no tiene triángulos, se generan en el momento", file=sys.stderr)
+        banco.cerrar()
+        return None
+    return banco
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Banco de triángulos precalculados.")
+    sub = p.add_subparsers(dest="orden", required=True)
+    c = sub.add_parser("construir")
+    c.add_argument("-n", type=int, default=1_000_000, help="triángulos por tipo")
+    c.add_argument("--tipo", choices=TIPOS, action="append",
+                   help="tipos a incluir (por defecto todos)")
+    c.add_argument("--scale", type=float, default=1.0)
+    c.add_argument("--seed", type=int, default=None)
+    c.add_argument("--ssa", choices=["unica", "ambigua"], default=None,
+                   help="solo ejercicios de modo 1 (a, b, A) con esa cantidad de soluciones")
+    c.add_argument("-o", "--salida", default="banco.bin")
+    i = sub.add_parser("info")
+    i.add_argument("ruta")
+    args = p.parse_args(argv)
+
+    if args.orden == "construir":
+        tipos = args.tipo or TIPOS
+        filtro = filtro_ssa(args.ssa) if args.ssa else None
+        try:
+            total = construir(args.salida, {t: args.n for t in tipos}, args.scale,
+                              random.Random(args.seed), filtro=filtro)
+        except ValueError as e:
+            p.exit(1, f"banco.py: {e}\n")
+        print(f"{total} triángulos en {args.salida}")
+    else:
+        with Banco(args.ruta) as banco:
+            print(f"{len(banco)} triángulos, {REGISTRO.size} bytes por registro")
+            for tipo in TIPOS:
+                niveles = "  ".join(f"{NIVELES[n]} {banco.cantidad(tipo, n)}"
+                                    for n in range(len(NIVELES)))
+                print(f"  {tipo:<11} {banco.cantidad(tipo):>10}   {niveles}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,642 @@
+"""
+benchmarks.py
+Mediciones de rendimiento del generador.
+Uso: python benchmarks.py [n]
+     python benchmarks.py --suite [--json] [--umbral 0.25] [--guardar-base]
+     python benchmarks.py --importacion
+     python benchmarks.py --distribucion
+
+--suite corre solo los casos chicos con línea base (benchmarks_base.json): ns por
+operación de cada caso, comparados contra la base; sale con código 1 si alguno
+empeora más que el umbral. La base depende de la máquina: regenerarla con
+--guardar-base al cambiar de equipo.
+
+--importacion solo mide cuánto tarda `import triangulos` contra el presupuesto
+(y que no arrastre tkinter); sale con código 1 si se pasa.
+--distribucion solo corre la prueba chi-cuadrado del muestreo exacto contra el
+bucle de rechazo; sale con código 1 si algún tipo falla.
+"""
+
+import argparse, asyncio, gc, io, json, math, os, platform, sys, time, random, subprocess, tempfile, tracemalloc
+
+from triangulos import (CLAVES, LIMITES, MODOS, TIPOS, comprobar_respuesta, generar_triangulo,
+                        generar_triangulos, law_of_cosines_angle, muestrear_angulos,
+                        seleccionar_lote, seleccionar_medidas)
+from calificar import calificar_lote
+from resolver import clasificar_ssa, generar_ssa, resolver_lote, resolver_triangulo
+from paralelo import generar_paralelo
+from compacto import BancoTriangulos, Triangulo
+import disposicion, dibujo_svg
+from medicion import percentiles
+from duplicados import IndiceEjercicios
+import servidor
+import banco, historial, cobertura
+
+# presupuesto de importación del núcleo (microsegundos, acumulado)
+PRESUPUESTO_IMPORT_US = 25_000
+
+def medir(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+# --------------------------
+# Lote vs. uno por uno
+# --------------------------
+def bench_generar(n=100_000):
+    print(f"generar_triangulo x{n} vs generar_triangulos({n})")
+    for tipo in TIPOS:
+        t_uno = medir(lambda: [generar_triangulo(tipo) for _ in range(n)])
+        t_lote = medir(generar_triangulos, n, tipo)
+        print(f"  {tipo:<11} uno a uno: {n/t_uno:>10,.0f} tri/s   "
+              f"lote: {n/t_lote:>10,.0f} tri/s   x{t_uno/t_lote:.2f}")
+
+# --------------------------
+# Muestreo exacto vs. bucle de rechazo
+# --------------------------
+def angulos_por_rechazo(tipo, rng):
+    # el bucle original de random_angles_for (hasta 30 intentos y luego 50/60/70);
+    # devuelve también cuántos sorteos de (A, B) se usaron
+    a0, a1, b0, b1, c0, c1 = LIMITES[tipo]
+    for intento in range(1, 31):
+        A = rng.uniform(a0, a1)
+        B = rng.uniform(b0, b1)
+        C = 180 - A - B
+        if c0 < C < c1:
+            return (A, B, C), intento
+    return (50.0, 60.0, 70.0), 30
+
+def bench_sorteos(n=100_000):
+    print(f"sorteos de (A, B) por triángulo, n={n}")
+    rng = random.Random(0)
+    for tipo in LIMITES:
+        sorteos = sum(angulos_por_rechazo(tipo, rng)[1] for _ in range(n))
+        t_rech = medir(lambda: [angulos_por_rechazo(tipo, rng) for _ in range(n)])
+        t_exac = medir(lambda: [muestrear_angulos(tipo, rng) for _ in range(n)])
+        print(f"  {tipo:<10} rechazo: {sorteos/n:.3f} sorteos/tri {n/t_rech:>10,.0f} tri/s   "
+              f"exacto: 1.000 sorteos/tri {n/t_exac:>10,.0f} tri/s")
+
+def prueba_distribucion(n=200_000, bins=10):
+    # chi-cuadrado de dos muestras sobre una grilla A x B: el muestreo exacto
+    # tiene que seguir la misma distribución uniforme que el bucle de rechazo;
+    # devuelve si todos los tipos pasan (y ningún sorteo queda fuera de los límites)
+    print(f"chi-cuadrado exacto vs rechazo ({bins}x{bins} celdas), n={n}")
+    rng = random.Random(1)
+    ok = True
+    for tipo in LIMITES:
+        a0, a1, b0, b1, c0, c1 = LIMITES[tipo]
+
+        def celda(A, B):
+            i = min(int((A - a0) / (a1 - a0) * bins), bins - 1)
+            j = min(int((B - b0) / (b1 - b0) * bins), bins - 1)
+            return i*bins + j
+
+        h_exac, h_rech = [0]*bins*bins, [0]*bins*bins
+        fuera = 0
+        for _ in range(n):
+            A, B, C = muestrear_angulos(tipo, rng)
+            if not (c0 < C < c1 and a0 <= A <= a1 and b0 <= B <= b1):
+                fuera += 1
+            h_exac[celda(A, B)] += 1
+            (A, B, C), _ = angulos_por_rechazo(tipo, rng)
+            h_rech[celda(A, B)] += 1
+
+        chi2, gl = 0.0, -1
+        for x, y in zip(h_exac, h_rech):
+            if x + y:
+                chi2 += (x - y)**2 / (x + y)
+                gl += 1
+        # aproximación normal del percentil 99.9 de chi-cuadrado
+        limite = gl + 3.09 * (2*gl) ** 0.5
+        paso = chi2 < limite and not fuera
+        ok = ok and paso
+        estado = "ok" if paso else "FALLA"
+        print(f"  {tipo:<10} chi2 = {chi2:8.1f}  gl = {gl:3d}  límite = {limite:6.1f}  {estado}"
+              + (f"  ({fuera} fuera de los límites)" if fuera else ""))
+    return ok
+
+# --------------------------
+# Resolución de triángulos
+# --------------------------
+CASOS = {
+    "SSA (modo 1)": ['a','b','A'],
+    "ASA (modo 2)": ['a','B','C'],
+    "SSS (modo 3)": ['a','b','c'],
+    "SAS": ['a','b','C'],
+}
+
+def bench_resolver(n=100_000):
+    print(f"resolver_triangulo x{n} vs resolver_lote({n})")
+    cols = generar_triangulos(n, "aleatorio", rng=random.Random(2))
+    for caso, claves in CASOS.items():
+        conocidas = {k: cols[k] for k in claves}
+        filas = [dict(zip(claves, v)) for v in zip(*conocidas.values())]
+        t_uno = medir(lambda: [resolver_triangulo(f) for f in filas])
+        t_lote = medir(resolver_lote, conocidas)
+        print(f"  {caso:<13} uno a uno: {n/t_uno:>10,.0f} tri/s   "
+              f"lote: {n/t_lote:>10,.0f} tri/s   x{t_uno/t_lote:.2f}")
+
+# --------------------------
+# Disposición de vértices
+# --------------------------
+def bench_disposicion(n=100_000, ancho=520, alto=420):
+    print(f"disposición de {n} triángulos, caja {ancho}x{alto}")
+    cols = generar_triangulos(n, "aleatorio", rng=random.Random(5))
+    a, b, c = cols['a'], cols['b'], cols['c']
+    disposicion.limpiar_cache()
+    t_uno = medir(lambda: [disposicion._calcular(x, y, z, ancho, alto, disposicion.MARGEN)
+                           for x, y, z in zip(a, b, c)])
+    disposicion.limpiar_cache()
+    t_lote = medir(disposicion.vertices_lote, a, b, c, ancho, alto)
+    # redibujos del mismo triángulo (cambio de modo): siempre aciertan en la caché
+    disposicion.vertices(a[0], b[0], c[0], ancho, alto)
+    t_cache = medir(lambda: [disposicion.vertices(a[0], b[0], c[0], ancho, alto) for _ in range(n)])
+    print(f"  sin caché: {n/t_uno:>12,.0f} tri/s")
+    print(f"  lote:      {n/t_lote:>12,.0f} tri/s")
+    print(f"  redibujo:  {n/t_cache:>12,.0f} tri/s (acierto en caché)")
+
+# --------------------------
+# SVG masivo
+# --------------------------
+def bench_svg(n=20_000, max_procesos=None):
+    max_procesos = max_procesos or os.cpu_count() or 1
+    ids = dibujo_svg.ids_ejercicios(n, rng=random.Random(6))
+    print(f"dibujo_svg: {n} ejercicios, de 1 a {max_procesos} procesos")
+    for p in sorted({1, max_procesos}):
+        with tempfile.TemporaryDirectory() as d:
+            t_arch = medir(dibujo_svg.escribir_archivos, ids, d, False, p)
+        t_doc = medir(dibujo_svg.escribir_documento, ids, io.StringIO(), False, p)
+        print(f"  {p:>2} procesos: archivos {n/t_arch:>9,.0f} svg/s   "
+              f"documento {n/t_doc:>9,.0f} svg/s")
+
+# --------------------------
+# Índice de casi-duplicados
+# --------------------------
+def bench_duplicados(n=300_000, distancia=0.001, tramo=50_000):
+    # tiempo por consulta+alta a medida que crece el índice: debería quedar plano
+    print(f"IndiceEjercicios(distancia={distancia}): {n} altas, µs por agregar() por tramo")
+    banco = BancoTriangulos.desde_columnas(generar_triangulos(n, "aleatorio", rng=random.Random(9)))
+    indice = IndiceEjercicios(distancia)
+    for inicio in range(0, n, tramo):
+        tris = banco[inicio:inicio + tramo]
+        t0 = time.perf_counter()
+        nuevos = sum(indice.agregar(t) for t in tris)
+        t = time.perf_counter() - t0
+        print(f"  candidatos {inicio + len(tris):>8,}  índice {len(indice):>8,}: "
+              f"{t/len(tris)*1e6:6.2f} µs   rechazados {len(tris) - nuevos}")
+
+# --------------------------
+# Servicio HTTP
+# --------------------------
+async def _post(reader, writer, ruta, cuerpo):
+    datos = json.dumps(cuerpo).encode()
+    writer.write(f"POST {ruta} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(datos)}\r\n\r\n"
+                 .encode() + datos)
+    await writer.drain()
+    estado = int((await reader.readline()).split()[1])
+    largo = 0
+    while (linea := await reader.readline()) != b"\r\n":
+        if linea.lower().startswith(b"content-length:"):
+            largo = int(linea.split(b":")[1])
+    return estado, json.loads(await reader.readexactly(largo))
+
+async def _alumno(puerto, rondas, tiempos):
+    reader, writer = await asyncio.open_connection("127.0.0.1", puerto)
+    sesion = None
+    for _ in range(rondas):
+        for ruta in ("/generar", "/pista", "/verificar"):
+            pedido = {"sesion": sesion, "respuestas": {"c": "1.0", "B": "30"}}
+            t0 = time.perf_counter()
+            estado, r = await _post(reader, writer, ruta, pedido)
+            tiempos.append(time.perf_counter() - t0)
+            assert estado == 200, r
+            sesion = sesion or r["sesion"]
+    writer.close()
+
+async def _bench_servidor(alumnos, rondas):
+    srv, servicio = await servidor.iniciar(puerto=0)
+    puerto = srv.sockets[0].getsockname()[1]
+    tiempos = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_alumno(puerto, rondas, tiempos) for _ in range(alumnos)))
+    t = time.perf_counter() - t0
+    srv.close()
+    servicio.cerrar()
+    return t, tiempos, len(servicio.sesiones.datos)
+
+def bench_servidor(alumnos=2000, rondas=3):
+    # alumnos con conexiones abiertas a la vez, cada uno: generar -> pista -> verificar
+    t, tiempos, sesiones = asyncio.run(_bench_servidor(alumnos, rondas))
+    p = percentiles(tiempos)
+    print(f"servidor: {alumnos} alumnos concurrentes, {sesiones} sesiones, {len(tiempos)} pedidos")
+    print(f"  {len(tiempos)/t:>10,.0f} pedidos/s   p50 {p[50]:.2f}  p95 {p[95]:.2f}  p99 {p[99]:.2f} ms")
+
+# --------------------------
+# Banco en mmap
+# --------------------------
+def bench_banco(n=250_000, sorteos=100_000):
+    print(f"banco: {n} por tipo; abrir y sortear {sorteos} 'agudo' vs generar_triangulo")
+    with tempfile.TemporaryDirectory() as d:
+        ruta = os.path.join(d, "banco.bin")
+        t_construir = medir(banco.construir, ruta, {t: n for t in TIPOS}, 1.0, random.Random(10))
+        t0 = time.perf_counter()
+        b = banco.Banco(ruta)
+        t_abrir = time.perf_counter() - t0
+        rng = random.Random(11)
+        t_sortear = medir(lambda: [b.sortear("agudo", rng) for _ in range(sorteos)])
+        t_generar = medir(lambda: [generar_triangulo("agudo", rng=rng) for _ in range(sorteos)])
+        b.cerrar()
+    print(f"  construir {len(TIPOS)*n/t_construir:>10,.0f} tri/s   abrir {t_abrir*1000:.3f} ms")
+    print(f"  sortear   {sorteos/t_sortear:>10,.0f} tri/s   generar {sorteos/t_generar:>10,.0f} tri/s")
+
+# --------------------------
+# Historial de intentos
+# --------------------------
+def bench_historial(n=200_000):
+    # registrar() solo encola: se mide lo que paga quien corrige y, aparte,
+    # cuánto tarda el hilo en dejar todo en disco
+    print(f"historial: {n} intentos")
+    tris = [generar_triangulo(rng=random.Random(12)) for _ in range(1000)]
+    estados = {"c": "correcto", "B": "incorrecto", "C": "vacio"}
+    respuestas = {"c": "4.2", "B": "31", "C": ""}
+    with tempfile.TemporaryDirectory() as d:
+        ruta = os.path.join(d, "intentos.db")
+        h = historial.Historial(ruta)
+        t0 = time.perf_counter()
+        for i in range(n):
+            tri = tris[i % 1000]
+            h.registrar(tri, {"a": tri['a'], "b": tri['b'], "A": tri['A']}, estados, respuestas,
+                        f"alumno{i % 5000}", tipo="aleatorio", modo=i % 5)
+        t_registrar = time.perf_counter() - t0
+        h.cerrar()
+        t_total = time.perf_counter() - t0
+        con = historial.abrir(ruta)
+        t_alumno = medir(historial.intentos_de, con, "alumno42")
+        t_modo = medir(historial.resumen_por_modo, con)
+        con.close()
+    print(f"  registrar {t_registrar/n*1e6:.2f} µs   escritura {n/t_total:>10,.0f} intentos/s")
+    print(f"  consulta por alumno {t_alumno*1000:.2f} ms   resumen por modo {t_modo*1000:.1f} ms")
+
+# --------------------------
+# Clasificación SSA
+# --------------------------
+def bench_ssa(n=1_000_000):
+    print(f"clasificar_ssa({n}) y generar_ssa({n}) por caso")
+    cols = generar_triangulos(n, "aleatorio", rng=random.Random(13))
+    t = medir(clasificar_ssa, cols['a'], cols['b'], cols['A'])
+    print(f"  clasificar        {n/t*60:>14,.0f} ejercicios/min")
+    for caso in ("unica", "ambigua"):
+        t = medir(generar_ssa, n, caso, "aleatorio", 1.0, random.Random(14))
+        print(f"  generar {caso:<9} {n/t*60:>14,.0f} ejercicios/min")
+
+def bench_cobertura(paso=cobertura.PASO, objetivos=(0.9, 1.0)):
+    # triángulos necesarios para cubrir los estratos (celda, modo): al azar vs estratificado
+    print(f"cobertura de estratos (celdas de {paso:g}° x {len(MODOS)} modos)")
+    for tipo in TIPOS:
+        estratos = len(cobertura.celdas(tipo, paso)) * len(MODOS)
+        for objetivo in objetivos:
+            azar = cobertura.al_azar_hasta(objetivo, tipo, rng=random.Random(15), paso=paso)
+            necesarios = math.ceil(estratos * objetivo)
+            print(f"  {tipo:<11} {objetivo:>4.0%}  al azar {azar:>7,}   estratificado "
+                  f"{necesarios:>7,}   x{azar/necesarios:.1f}")
+    n = 1_000_000
+    t = medir(cobertura.generar_estratificado, n, "aleatorio", 1.0, random.Random(16), paso)
+    print(f"  generar_estratificado({n}) {n/t:>12,.0f} tri/s")
+
+def bench_seleccion(n=1_000_000):
+    # separar conocidas/ocultas de un banco grande: por triángulo vs por lote
+    print(f"seleccionar_medidas x{n} vs seleccionar_lote({n})")
+    cols = generar_triangulos(n, "aleatorio", rng=random.Random(17))
+    tris = [Triangulo(*f) for f in zip(*(cols[k] for k in CLAVES))]
+    modos = [i % len(MODOS) for i in range(n)]
+    t_uno = medir(lambda: [seleccionar_medidas(t, m) for t, m in zip(tris, modos)])
+    t_mezcla = medir(seleccionar_lote, cols, modos)
+    t_fijo = medir(seleccionar_lote, cols, 1)
+    print(f"  por triángulo    {n/t_uno:>14,.0f} tri/s")
+    print(f"  lote, mezcla     {n/t_mezcla:>14,.0f} tri/s   x{t_uno/t_mezcla:.1f}")
+    print(f"  lote, un modo    {n/t_fijo:>14,.0f} tri/s   x{t_uno/t_fijo:.0f}")
+
+# --------------------------
+# Escalado en procesos
+# --------------------------
+def bench_paralelo(n=1_000_000, max_procesos=None):
+    max_procesos = max_procesos or os.cpu_count() or 1
+    print(f"generar_paralelo({n}) de 1 a {max_procesos} procesos")
+    base = None
+    for p in range(1, max_procesos + 1):
+        t = medir(generar_paralelo, n, "aleatorio", 1.0, 0, p)
+        base = base or t
+        print(f"  {p:>2} procesos: {n/t:>12,.0f} tri/s   aceleración x{base/t:.2f}")
+
+# --------------------------
+# Memoria por triángulo
+# --------------------------
+def _bytes_de(construir):
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    obj = construir()
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return despues - antes
+
+def bench_memoria(n=1_000_000):
+    print(f"memoria de un banco de {n:,} triángulos")
+    cols = generar_triangulos(n, "aleatorio", rng=random.Random(3))
+    claves = list(cols)
+    filas = list(zip(*cols.values()))
+    # x*1.0 crea un float nuevo: cada triángulo paga sus propios floats, como al generarlo
+    formas = {
+        "lista de dicts": lambda: [dict(zip(claves, [x*1.0 for x in f])) for f in filas],
+        "lista de Triangulo": lambda: [Triangulo(*[x*1.0 for x in f]) for f in filas],
+        "BancoTriangulos": lambda: BancoTriangulos.desde_columnas(cols),
+    }
+    for nombre, construir in formas.items():
+        b = _bytes_de(construir)
+        print(f"  {nombre:<20} {b/n:>7.1f} bytes/triángulo  ({b/2**20:,.0f} MiB)")
+
+# --------------------------
+# Dibujo en el canvas (necesita display)
+# --------------------------
+def bench_dibujo(n=2000):
+    import tkinter as tk
+    import xd
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("dibujo: sin display, se omite")
+        return
+    root.withdraw()
+    app = xd.TriangulosApp(root)
+
+    def completo():
+        # lo que hacía draw() antes: borrar todo y volver a crear cada item
+        app.canvas.delete("all")
+        app.items.clear()
+        app.textos.clear()
+        app.draw()
+
+    casos = {
+        "borrar y recrear": completo,
+        "draw() en el lugar": app.draw,
+        "cambio de modo": lambda: app.draw(geometria=False),
+    }
+    print(f"latencia de draw() (ms), {n} llamadas")
+    for nombre, fn in casos.items():
+        tiempos = []
+        for i in range(n):
+            app.tri = generar_triangulo()
+            app.known, app.unknown = xd.seleccionar_medidas(app.tri, i % 5)
+            t0 = time.perf_counter()
+            fn()
+            root.update_idletasks()
+            tiempos.append(time.perf_counter() - t0)
+        p = percentiles(tiempos)
+        print(f"  {nombre:<20} p50 {p[50]:.3f}  p95 {p[95]:.3f}  p99 {p[99]:.3f}")
+    root.destroy()
+
+def _contar_widgets(w):
+    # widgets vivos según Tk y objetos que Python todavía tiene registrados en .children
+    tk_vivos = sum(_contar_widgets(h)[0] for h in w.winfo_children()) + 1
+    py_vivos = sum(_contar_widgets(h)[1] for h in list(w.children.values())) + 1
+    return tk_vivos, py_vivos
+
+def bench_soak(n=10_000, modulos=("xd2", "xd3"), cada=1000):
+    # muchas llamadas a nuevo_triangulo: el número de widgets y el tiempo por
+    # llamada tienen que quedarse planos
+    import importlib
+    import tkinter as tk
+    for nombre in modulos:
+        try:
+            root = tk.Tk()
+        except tk.TclError:
+            print("soak: sin display, se omite")
+            return
+        root.withdraw()
+        app = importlib.import_module(nombre).TriangulosApp(root)
+        print(f"soak {nombre}: {n} x nuevo_triangulo")
+        tiempos = []
+        for i in range(1, n + 1):
+            t0 = time.perf_counter()
+            app.nuevo_triangulo()
+            root.update_idletasks()
+            tiempos.append(time.perf_counter() - t0)
+            if i % cada == 0:
+                tk_vivos, py_vivos = _contar_widgets(root)
+                p = percentiles(tiempos)
+                print(f"  {i:>6}: widgets tk {tk_vivos:>5}  python {py_vivos:>5}   "
+                      f"p50 {p[50]:.3f} ms  p95 {p[95]:.3f} ms")
+                tiempos = []
+        root.destroy()
+
+def bench_precarga(n=2000, pausa=0.002):
+    # latencia clic -> cuadro de nuevo_triangulo con y sin la cola de precarga;
+    # la pausa entre clics simula al usuario y deja que la cola se rellene
+    import tkinter as tk
+    import xd
+    print(f"latencia clic -> cuadro (ms), {n} clics")
+    for precarga in (False, True):
+        try:
+            root = tk.Tk()
+        except tk.TclError:
+            print("precarga: sin display, se omite")
+            return
+        root.withdraw()
+        app = xd.TriangulosApp(root, precarga=precarga)
+        time.sleep(0.1)
+        tiempos = []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            app.nuevo_triangulo()
+            root.update_idletasks()
+            tiempos.append(time.perf_counter() - t0)
+            time.sleep(pausa)
+        p = percentiles(tiempos)
+        nombre = "con precarga" if precarga else "sin precarga"
+        print(f"  {nombre:<13} p50 {p[50]:.3f}  p95 {p[95]:.3f}  p99 {p[99]:.3f}")
+        if app.precarga:
+            app.precarga.cerrar()
+        root.destroy()
+
+# --------------------------
+# Tiempo de importación del núcleo
+# --------------------------
+def bench_importacion(modulo="triangulos", repeticiones=5):
+    # python -X importtime escribe en stderr "import time: propio | acumulado | módulo";
+    # se toma la mejor de varias corridas para no medir el disco frío
+    mejor, modulos = None, set()
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                                capture_output=True, text=True, check=True).stderr
+        for linea in salida.splitlines():
+            if not linea.startswith("import time:") or "|" not in linea:
+                continue
+            _, acumulado, nombre = linea[len("import time:"):].split("|")
+            modulos.add(nombre.strip())
+            if nombre.strip() == modulo and acumulado.strip().isdigit():
+                us = int(acumulado)
+                mejor = us if mejor is None else min(mejor, us)
+    estado = "ok" if mejor <= PRESUPUESTO_IMPORT_US else "EXCEDE"
+    print(f"import {modulo}: {mejor/1000:.1f} ms (presupuesto {PRESUPUESTO_IMPORT_US/1000:.0f} ms) {estado}")
+    if "tkinter" in modulos:
+        print(f"  ERROR: {modulo} importa tkinter")
+    return mejor <= PRESUPUESTO_IMPORT_US and "tkinter" not in modulos
+
+# --------------------------
+# Suite con línea base
+# --------------------------
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks_base.json")
+UMBRAL = 0.25   # más de +25% sobre la base cuenta como regresión
+
+def _ns_por_op(fn, ops, repeticiones):
+    # la mejor de varias corridas es la menos afectada por el resto del sistema;
+    # sin el recolector de ciclos, que si no cae en corridas distintas cada vez
+    gc.collect()
+    gc.disable()
+    try:
+        return min(medir(fn) for _ in range(repeticiones)) / ops * 1e9
+    finally:
+        gc.enable()
+
+def casos_suite(n=20_000):
+    # nombre -> (función sin argumentos, operaciones que hace)
+    rng = random.Random(8)
+    casos = {}
+    for tipo in TIPOS:
+        casos[f"generar_triangulo/{tipo}"] = (
+            lambda tipo=tipo: [generar_triangulo(tipo, rng=rng) for _ in range(n)], n)
+
+    tris = [generar_triangulo(rng=rng) for _ in range(n)]
+    for m in range(len(MODOS)):
+        casos[f"seleccionar_medidas/{m}"] = (
+            lambda m=m: [seleccionar_medidas(t, m) for t in tris], n)
+    # el mismo lote en columnas, con un modo distinto por fila
+    cols = {k: [t[k] for t in tris] for k in CLAVES}
+    modos = [rng.randrange(len(MODOS)) for _ in range(n)]
+    casos["seleccionar_lote/mezcla"] = (lambda: seleccionar_lote(cols, modos), n)
+
+    lados = [(t['a'], t['b'], t['c']) for t in tris]
+    casos["law_of_cosines_angle"] = (
+        lambda: [law_of_cosines_angle(a, b, c) for a, b, c in lados], n)
+
+    # geometría de _draw_triangle, sin Tk: cálculo nuevo y redibujo con caché
+    margen = disposicion.MARGEN
+    casos["disposicion/calcular"] = (
+        lambda: [disposicion._calcular(a, b, c, 520, 420, margen) for a, b, c in lados], n)
+    a, b, c = lados[0]
+    casos["disposicion/vertices_cache"] = (
+        lambda: [disposicion.vertices(a, b, c, 520, 420) for _ in range(n)], n)
+
+    # lo que hace verificar_respuestas por cada medida oculta, y su versión por lotes
+    reales = [t['c'] for t in tris]
+    entradas = [f"{r + rng.uniform(-0.2, 0.2):.2f}" for r in reales]
+    casos["comprobar_respuesta"] = (
+        lambda: [comprobar_respuesta(e, r) for e, r in zip(entradas, reales)], n)
+    casos["calificar_lote"] = (lambda: calificar_lote({"c": reales}, {"c": entradas}), n)
+    return casos
+
+def correr_suite(casos, repeticiones=9, nombres=None):
+    return {nombre: round(_ns_por_op(fn, ops, repeticiones), 1)
+            for nombre, (fn, ops) in casos.items() if nombres is None or nombre in nombres}
+
+def comparar(resultados, base, umbral=UMBRAL):
+    # devuelve [(nombre, base, actual, cociente)] de los casos que empeoraron
+    regresiones = []
+    for nombre, actual in resultados.items():
+        ref = base.get(nombre)
+        if ref and actual > ref * (1 + umbral):
+            regresiones.append((nombre, ref, actual, actual / ref))
+    return regresiones
+
+def _maquina():
+    return {"python": platform.python_version(), "plataforma": platform.platform(),
+            "procesador": platform.machine()}
+
+CONFIRMACIONES = 2
+
+def suite(args):
+    casos = casos_suite(args.n_suite)
+    resultados = correr_suite(casos, args.repeticiones)
+    base = {}
+    if os.path.exists(args.base):
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)["resultados"]
+    # un caso pasado del umbral se vuelve a medir antes de contarlo como regresión:
+    # una sola corrida lenta suele ser ruido de la máquina
+    regresiones = comparar(resultados, base, args.umbral)
+    for _ in range(CONFIRMACIONES):
+        if not regresiones:
+            break
+        otra = correr_suite(casos, args.repeticiones, {r[0] for r in regresiones})
+        for nombre, ns in otra.items():
+            resultados[nombre] = min(resultados[nombre], ns)
+        regresiones = comparar(resultados, base, args.umbral)
+
+    if args.json:
+        json.dump({"maquina": _maquina(), "umbral": args.umbral, "resultados": resultados,
+                   "base": base,
+                   "regresiones": [{"caso": r[0], "base": r[1], "actual": r[2],
+                                    "cociente": round(r[3], 3)} for r in regresiones]},
+                  sys.stdout, indent=2)
+        print()
+    else:
+        print(f"suite: ns por operación (umbral +{args.umbral:.0%})")
+        lentos = {r[0] for r in regresiones}
+        for nombre, ns in resultados.items():
+            ref = base.get(nombre)
+            rel = f"x{ns/ref:.2f}" if ref else "sin base"
+            marca = "  REGRESIÓN" if nombre in lentos else ""
+            print(f"  {nombre:<28} {ns:>10,.1f}   {rel}{marca}")
+
+    if args.guardar_base:
+        with open(args.base, "w", encoding="utf-8") as f:
+            json.dump({"maquina": _maquina(), "resultados": resultados}, f, indent=2)
+            f.write("\n")
+    return not regresiones
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Mediciones de rendimiento.")
+    p.add_argument("n", nargs="?", type=int, default=100_000)
+    p.add_argument("--suite", action="store_true", help="solo la suite con línea base")
+    p.add_argument("--n-suite", type=int, default=20_000, help="operaciones por caso")
+    p.add_argument("--repeticiones", type=int, default=9)
+    p.add_argument("--json", action="store_true", help="resultados en JSON por stdout")
+    p.add_argument("--base", default=BASE)
+    p.add_argument("--umbral", type=float, default=UMBRAL)
+    p.add_argument("--guardar-base", action="store_true")
+    p.add_argument("--importacion", action="store_true",
+                   help="solo el tiempo de import de triangulos contra el presupuesto")
+    p.add_argument("--distribucion", action="store_true",
+                   help="solo la prueba chi-cuadrado del muestreo exacto")
+    args = p.parse_args()
+
+    if args.importacion:
+        sys.exit(0 if bench_importacion() else 1)
+    if args.distribucion:
+        sys.exit(0 if prueba_distribucion() else 1)
+    if args.suite:
+        sys.exit(0 if suite(args) else 1)
+
+    # primero lo barato: si el import se pasó del presupuesto se ve enseguida
+    importacion_ok = bench_importacion()
+    n = args.n
+    bench_generar(n)
+    bench_sorteos(n)
+    distribucion_ok = prueba_distribucion()
+    bench_resolver(n)
+    bench_ssa(10*n)
+    bench_cobertura()
+    bench_seleccion(n)
+    bench_disposicion(n)
+    bench_svg()
+    bench_duplicados()
+    bench_servidor()
+    bench_banco()
+    bench_historial()
+    bench_paralelo(10*n)
+    bench_memoria()
+    bench_dibujo()
+    bench_soak()
+    bench_precarga()
+    if not (importacion_ok and distribucion_ok):
+        sys.exit(1)
@@ -0,0 +1,152 @@
+"""
+calificar.py
+Corrección masiva de respuestas, sin interfaz gráfica.
+Misma regla que verificar_respuestas pero para una clase completa de una vez,
+con tolerancia absoluta y relativa configurable por medida.
+
+El CSV de entrada es el de exportar.py (tipo, modo, a..C, conocidas, ocultas)
+más una columna "alumno" y una columna "resp_<medida>" por cada medida oculta.
+
+Uso:
+    python calificar.py clase.csv --tol A=0.5 --tol-rel a=0.01 -o resultados.csv
+"""
+
+import argparse, csv, sys
+
+from triangulos import CLAVES, TOLERANCIAS, comprobar_respuesta, dentro_de_tolerancia
+
+ESTADOS = ["correcto", "incorrecto", "vacio", "invalido"]
+
+# --------------------------
+# Corrección por lotes
+# --------------------------
+def _corregir_columna(respuestas, reales, tol, tol_rel):
+    estados = []
+    agregar = estados.append
+    for v, real in zip(respuestas, reales):
+        if v is None:
+            # la medida no se pidió en esta fila
+            agregar(None)
+        elif isinstance(v, str):
+            agregar(comprobar_respuesta(v, real, tol, tol_rel)[0])
+        elif dentro_de_tolerancia(v, real, tol, tol_rel):
+            agregar("correcto")
+        else:
+            agregar("incorrecto")
+    return estados
+
+def calificar_lote(reales, respuestas, tolerancias=None):
+    # reales: {"a": [...], ...} con los valores del triángulo de cada fila
+    # respuestas: {"c": [...], "B": [...]} con lo que contestó cada alumno;
+    #   número o texto, "" si lo dejó vacío y None si esa medida no se le pidió
+    # tolerancias: {"A": (absoluta, relativa)}; lo que falte usa TOLERANCIAS
+    tol = dict(TOLERANCIAS)
+    tol.update(tolerancias or {})
+
+    estados = {k: _corregir_columna(col, reales[k], *tol[k])
+               for k, col in respuestas.items()}
+
+    n = len(next(iter(reales.values()), []))
+    correctos, total = [0]*n, [0]*n
+    por_medida = {}
+    for k, col in estados.items():
+        conteo = dict.fromkeys(ESTADOS, 0)
+        for i, e in enumerate(col):
+            if e is None:
+                continue
+            total[i] += 1
+            conteo[e] += 1
+            if e == "correcto":
+                correctos[i] += 1
+        por_medida[k] = conteo
+
+    return {
+        "estados": estados,
+        "correctos": correctos,
+        "total": total,
+        "resumen": {
+            "filas": n,
+            "perfectos": sum(1 for c, t in zip(correctos, total) if t and c == t),
+            "correctos": sum(correctos),
+            "respuestas": sum(total),
+            "por_medida": por_medida,
+        },
+    }
+
+# --------------------------
+# CSV
+# --------------------------
+def leer_csv(archivo):
+    # devuelve (alumnos, reales, respuestas) en columnas listas para calificar_lote
+    alumnos = []
+    reales = {k: [] for k in CLAVES}
+    respuestas = {k: [] for k in CLAVES}
+    for fila in csv.DictReader(archivo):
+        alumnos.append(fila.get("alumno", ""))
+        ocultas = fila.get("ocultas", "").split()
+        for k in CLAVES:
+            reales[k].append(float(fila[k]))
+            respuestas[k].append(fila.get(f"resp_{k}", "") if k in ocultas else None)
+    respuestas = {k: col for k, col in respuestas.items()
+                  if any(v is not None for v in col)}
+    return alumnos, reales, respuestas
+
+def escribir_resultados(alumnos, resultado, salida):
+    estados = resultado["estados"]
+    claves = [k for k in CLAVES if k in estados]
+    w = csv.writer(salida)
+    w.writerow(["alumno", "correctos", "total"] + claves)
+    for i, alumno in enumerate(alumnos):
+        w.writerow([alumno, resultado["correctos"][i], resultado["total"][i]]
+                   + [estados[k][i] or "" for k in claves])
+
+def _tolerancia(texto):
+    # "MEDIDA=VALOR" -> (medida, valor); type= de argparse para --tol y --tol-rel
+    k, igual, valor = texto.partition("=")
+    if not igual:
+        raise argparse.ArgumentTypeError(f"se espera MEDIDA=VALOR, no {texto!r}")
+    if k not in TOLERANCIAS:
+        raise argparse.ArgumentTypeError(f"medida desconocida: {k!r}")
+    try:
+        return k, float(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"valor inválido para {k}: {valor!r}")
+
+def _tolerancias_cli(absolutas, relativas):
+    tol = {k: list(v) for k, v in TOLERANCIAS.items()}
+    for lista, pos in ((absolutas, 0), (relativas, 1)):
+        for k, valor in lista:
+            tol[k][pos] = valor
+    return {k: tuple(v) for k, v in tol.items()}
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Califica un CSV de respuestas de una clase.")
+    p.add_argument("entrada", help="CSV con las respuestas (- = stdin)")
+    p.add_argument("--tol", action="append", default=[], type=_tolerancia, metavar="MEDIDA=VALOR",
+                   help="tolerancia absoluta para una medida (se puede repetir)")
+    p.add_argument("--tol-rel", action="append", default=[], type=_tolerancia,
+                   metavar="MEDIDA=VALOR",
+                   help="tolerancia relativa para una medida (se puede repetir)")
+    p.add_argument("-o", "--salida", default="-", help="CSV de resultados (- = stdout)")
+    args = p.parse_args(argv)
+
+    tolerancias = _tolerancias_cli(args.tol, args.tol_rel)
+    if args.entrada == "-":
+        alumnos, reales, respuestas = leer_csv(sys.stdin)
+    else:
+        with open(args.entrada, encoding="utf-8", newline="") as f:
+            alumnos, reales, respuestas = leer_csv(f)
+
+    resultado = calificar_lote(reales, respuestas, tolerancias)
+    if args.salida == "-":
+        escribir_resultados(alumnos, resultado, sys.stdout)
+    else:
+        with open(args.salida, "w", encoding="utf-8", newline="") as f:
+            escribir_resultados(alumnos, resultado, f)
+
+    r = resultado["resumen"]
+    print(f"{r['filas']} filas, {r['perfectos']} perfectas, "
+          f"{r['correctos']}/{r['respuestas']} respuestas correctas", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
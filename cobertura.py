@@ -0,0 +1,175 @@
+"""
+cobertura.py
+Muestreo estratificado para hojas de ejercicios que cubran todo el espacio:
+la región válida de (A, B) de cada tipo se parte en celdas de PASO grados
+(el rectángulo, que tiene B = 90, solo en tramos de A) y cada estrato
+(celda, modo) recibe la misma cuota. Sorteando al azar hacen falta muchos más
+triángulos para tocar todos los estratos (el último estrato que falta tarda en
+salir, como en el problema del coleccionista); acá alcanza con uno por estrato.
+
+Cada celda es el polígono de la región recortado a la celda, así que el sorteo
+adentro es exacto y sin rechazo (mismo abanico que triangulos.REGIONES), y se
+sortea una celda entera por pasada.
+
+Uso:
+    python cobertura.py --tipo aleatorio --paso 5
+"""
+
+import argparse, math, random
+from bisect import bisect_right
+
+from triangulos import (LIMITES, MODOS, TIPOS, abanico, generar_triangulos,
+                        lados_desde_angulos, poligono_region, recortar)
+
+PASO = 5.0
+RECTANGULO = (20, 70)   # A del rectángulo, como en generar_triangulo
+
+def _corte_eje(eje, v):
+    # punto del segmento pq donde la coordenada `eje` vale v
+    def corte(p, q):
+        t = (v - p[eje]) / (q[eje] - p[eje])
+        return (p[0] + t*(q[0] - p[0]), p[1] + t*(q[1] - p[1]))
+    return corte
+
+def _recortar_celda(poligono, x0, x1, y0, y1):
+    for eje, v, arriba in ((0, x0, True), (0, x1, False), (1, y0, True), (1, y1, False)):
+        if len(poligono) < 3:
+            break
+        dentro = (lambda p, e=eje, v=v: p[e] >= v) if arriba else (lambda p, e=eje, v=v: p[e] <= v)
+        poligono = recortar(poligono, dentro, _corte_eje(eje, v))
+    return poligono
+
+# --------------------------
+# Celdas
+# --------------------------
+def celdas(tipo="aleatorio", paso=PASO):
+    # {(i, j): (triángulos, acumulado)} con las celdas que tocan la región con área > 0;
+    # el rectángulo usa j = 0 y un tramo de A por celda
+    if tipo == "rectangulo":
+        a0, a1 = RECTANGULO
+        return {(i, 0): (max(a0, i*paso), min(a1, (i + 1)*paso))
+                for i in range(math.floor(a0 / paso), math.ceil(a1 / paso))
+                if min(a1, (i + 1)*paso) > max(a0, i*paso)}
+    a0, a1, b0, b1, _, _ = LIMITES.get(tipo, LIMITES["aleatorio"])
+    poligono = poligono_region(tipo if tipo in LIMITES else "aleatorio")
+    salida = {}
+    for i in range(math.floor(a0 / paso), math.ceil(a1 / paso)):
+        for j in range(math.floor(b0 / paso), math.ceil(b1 / paso)):
+            trozo = _recortar_celda(poligono, i*paso, (i + 1)*paso, j*paso, (j + 1)*paso)
+            triangulos, acumulado, area = abanico(trozo)
+            if area > 1e-9:
+                salida[i, j] = (triangulos, acumulado)
+    return salida
+
+def celda_de(A, B, paso=PASO, tipo="aleatorio"):
+    return (math.floor(A / paso), 0 if tipo == "rectangulo" else math.floor(B / paso))
+
+def _angulos_en(celda, tipo, m, rng):
+    # m puntos uniformes dentro de una celda
+    u = rng.random
+    if tipo == "rectangulo":
+        x0, x1 = celda
+        A = [x0 + (x1 - x0)*u() for _ in range(m)]
+        return A, [90.0]*m, [90.0 - x for x in A]
+    triangulos, acumulado = celda
+    ultimo = len(acumulado) - 1
+    sqrt = math.sqrt
+    A, B = [], []
+    for _ in range(m):
+        x0, y0, dx1, dy1, dx2, dy2 = triangulos[bisect_right(acumulado, u(), 0, ultimo)]
+        s = sqrt(u())
+        r = u()
+        w1, w2 = s*(1 - r), s*r
+        A.append(x0 + w1*dx1 + w2*dx2)
+        B.append(y0 + w1*dy1 + w2*dy2)
+    return A, B, [180 - x - y for x, y in zip(A, B)]
+
+# --------------------------
+# Generación estratificada
+# --------------------------
+def generar_estratificado(n, tipo="aleatorio", scale=1.0, rng=None, paso=PASO, modos=None):
+    # n triángulos repartidos por igual entre los estratos (celda, modo); si n no
+    # es múltiplo, el resto va a estratos sorteados. Devuelve las columnas de
+    # generar_triangulos más "modo", mezcladas para que la hoja no salga ordenada.
+    rng = rng or random.Random()
+    modos = list(range(len(MODOS))) if modos is None else list(modos)
+    por_celda = celdas(tipo, paso)
+    estratos = [(c, m) for c in por_celda for m in modos]
+    base, resto = divmod(n, len(estratos))
+    extra = set(rng.sample(range(len(estratos)), resto))
+
+    # una pasada por celda: se sortean juntas todas las cuotas de sus modos
+    A, B, C, modo = [], [], [], []
+    for k in range(0, len(estratos), len(modos)):
+        celda = estratos[k][0]
+        cuotas = [(estratos[k + i][1], base + (k + i in extra)) for i in range(len(modos))]
+        m = sum(q for _, q in cuotas)
+        if not m:
+            continue
+        a, b, c = _angulos_en(por_celda[celda], tipo, m, rng)
+        A += a
+        B += b
+        C += c
+        for md, q in cuotas:
+            modo += [md] * q
+
+    orden = list(range(len(A)))
+    rng.shuffle(orden)
+    cols = lados_desde_angulos([A[i] for i in orden], [B[i] for i in orden],
+                               [C[i] for i in orden], scale, rng)
+    cols["modo"] = [modo[i] for i in orden]
+    return cols
+
+def cobertura(cols, tipo="aleatorio", paso=PASO, modos=None):
+    # fracción de estratos (celda, modo) con al menos un ejercicio; sin columna
+    # "modo" cuenta solo celdas
+    modos = list(range(len(MODOS))) if modos is None else list(modos)
+    validas = celdas(tipo, paso)
+    if "modo" in cols:
+        vistos = {(celda_de(x, y, paso, tipo), m) for x, y, m in zip(cols['A'], cols['B'], cols['modo'])}
+        total = len(validas) * len(modos)
+        return len({(c, m) for c, m in vistos if c in validas and m in modos}) / total
+    vistos = {celda_de(x, y, paso, tipo) for x, y in zip(cols['A'], cols['B'])}
+    return len(vistos & validas.keys()) / len(validas)
+
+def al_azar_hasta(objetivo, tipo="aleatorio", scale=1.0, rng=None, paso=PASO, modos=None,
+                  bloque=1000, limite=10_000_000):
+    # cuántos triángulos sorteados al azar (con modo al azar) hacen falta para
+    # llegar a `objetivo` de cobertura; sirve para comparar con el estratificado
+    rng = rng or random.Random()
+    modos = list(range(len(MODOS))) if modos is None else list(modos)
+    validas = celdas(tipo, paso)
+    total = len(validas) * len(modos)
+    vistos = set()
+    hechos = 0
+    while hechos < limite:
+        cols = generar_triangulos(bloque, tipo, scale, rng)
+        for i, (x, y) in enumerate(zip(cols['A'], cols['B'])):
+            c = celda_de(x, y, paso, tipo)
+            if c in validas:
+                vistos.add((c, rng.choice(modos)))
+            if len(vistos) >= objetivo * total:
+                return hechos + i + 1
+        hechos += bloque
+    return None
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Cobertura de estratos (celda de ángulos, modo).")
+    p.add_argument("--tipo", choices=TIPOS, default="aleatorio")
+    p.add_argument("--paso", type=float, default=PASO, help="lado de la celda en grados")
+    p.add_argument("--objetivo", type=float, default=1.0, help="fracción de estratos a cubrir")
+    p.add_argument("--seed", type=int, default=None)
+    args = p.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    n_celdas = len(celdas(args.tipo, args.paso))
+    estratos = n_celdas * len(MODOS)
+    n = math.ceil(args.objetivo * estratos)
+    cols = generar_estratificado(n, args.tipo, rng=rng, paso=args.paso)
+    print(f"{args.tipo}: {n_celdas} celdas x {len(MODOS)} modos = {estratos} estratos")
+    print(f"  estratificado: {n} triángulos, cobertura {cobertura(cols, args.tipo, args.paso):.1%}")
+    azar = al_azar_hasta(args.objetivo, args.tipo, rng=rng, paso=args.paso)
+    print(f"  al azar:       {azar} triángulos")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+compacto.py
+Representación compacta de triángulos.
+- Triangulo: registro con __slots__ para un triángulo suelto; se lee igual
+  que el dict de antes (tri['a'], tri.items(), dict(tri)).
+- BancoTriangulos: muchos triángulos en un solo array('d') contiguo,
+  6 doubles (48 bytes) por triángulo; columna()/columnas() devuelven copias.
+"""
+
+from array import array
+from collections.abc import Mapping
+
+CLAVES = ('a','b','c','A','B','C')
+_CLAVES = frozenset(CLAVES)
+
+# --------------------------
+# Un triángulo
+# --------------------------
+class Triangulo(Mapping):
+    __slots__ = CLAVES
+
+    def __init__(self, a, b, c, A, B, C):
+        self.a, self.b, self.c = a, b, c
+        self.A, self.B, self.C = A, B, C
+
+    @classmethod
+    def desde_dict(cls, d):
+        return cls(*(d[k] for k in CLAVES))
+
+    def __getitem__(self, k):
+        if k not in _CLAVES:
+            raise KeyError(k)
+        return getattr(self, k)
+
+    def __iter__(self):
+        return iter(CLAVES)
+
+    def __len__(self):
+        return 6
+
+    def __repr__(self):
+        return "Triangulo(" + ", ".join(f"{k}={getattr(self, k)}" for k in CLAVES) + ")"
+
+    def __reduce__(self):
+        return (Triangulo, tuple(getattr(self, k) for k in CLAVES))
+
+# --------------------------
+# Colección de triángulos
+# --------------------------
+class BancoTriangulos:
+    __slots__ = ("datos",)
+
+    def __init__(self, datos=None):
+        # datos: array('d') con (a, b, c, A, B, C) seguidos por cada triángulo
+        self.datos = array('d') if datos is None else datos
+
+    @classmethod
+    def desde_columnas(cls, cols):
+        # cols: {"a": [...], ...} como devuelve generar_triangulos
+        n = len(cols['a'])
+        datos = array('d', bytes(8 * 6 * n))
+        for j, k in enumerate(CLAVES):
+            datos[j::6] = array('d', cols[k])
+        return cls(datos)
+
+    def __len__(self):
+        return len(self.datos) // 6
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            inicio, fin, paso = i.indices(len(self))
+            if paso != 1:
+                raise ValueError("BancoTriangulos solo admite cortes con paso 1")
+            return BancoTriangulos(self.datos[6*inicio:6*fin])
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("índice fuera del banco")
+        o = 6 * i
+        return Triangulo(*self.datos[o:o+6])
+
+    def __iter__(self):
+        datos = self.datos
+        for o in range(0, len(datos), 6):
+            yield Triangulo(*datos[o:o+6])
+
+    def append(self, tri):
+        self.datos.extend([tri[k] for k in CLAVES])
+
+    def extend(self, tris):
+        for tri in tris:
+            self.append(tri)
+
+    def columna(self, k):
+        # copia: array('d') nuevo con la medida k de cada triángulo, no una vista.
+        # Una vista (memoryview) bloquearía append mientras exista.
+        return self.datos[CLAVES.index(k)::6]
+
+    def columnas(self):
+        return {k: self.columna(k) for k in CLAVES}
+
+    @property
+    def nbytes(self):
+        return len(self.datos) * self.datos.itemsize
+
+    def guardar(self, ruta):
+        with open(ruta, "wb") as f:
+            self.datos.tofile(f)
+
+    @classmethod
+    def cargar(cls, ruta):
+        datos = array('d')
+        with open(ruta, "rb") as f:
+            datos.frombytes(f.read())
+        return cls(datos)
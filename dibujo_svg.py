@@ -0,0 +1,181 @@
+"""
+dibujo_svg.py
+Dibuja ejercicios como SVG, sin display: el mismo diagrama que el canvas de
+TriangulosApp (polígono, puntos, vértices, lados y ángulos, con "?" en las
+medidas ocultas). Cada ejercicio sale de un ID de ejercicios.py, que se imprime
+al pie del dibujo, así la hoja y su clave de respuestas se regeneran igual.
+
+Modo masivo: los IDs se reparten por bloques entre procesos; cada proceso
+dibuja su bloque y, o bien escribe un .svg por ejercicio en un directorio, o
+devuelve los dibujos para un único documento HTML con un ejercicio por página.
+
+Uso:
+    python dibujo_svg.py -n 20000 --tipo agudo --modo 1 --seed 7 -o hojas/
+    python dibujo_svg.py -n 200 --seed 7 --documento hoja.html
+    python dibujo_svg.py -n 200 --seed 7 --documento clave.html --clave
+"""
+
+import argparse, os, random
+from concurrent.futures import ProcessPoolExecutor
+
+from disposicion import vertices
+from ejercicios import crear_id, ejercicio_desde_id, id_a_texto
+from triangulos import MODOS, TIPOS
+
+ANCHO = 520
+ALTO = 420
+BLOQUE = 500
+
+# --------------------------
+# Un ejercicio
+# --------------------------
+def _texto(x, y, txt, estilo, color="black"):
+    return (f'<text x="{x:.1f}" y="{y:.1f}" {estilo} fill="{color}" '
+            f'text-anchor="middle" dominant-baseline="central">{txt}</text>')
+
+def svg_ejercicio(tri, known, ancho=ANCHO, alto=ALTO, solucion=False, pie=""):
+    # solucion=True: muestra también las medidas ocultas (en rojo), para la clave
+    Ax, Ay, Bx, By, Cx, Cy = vertices(float(tri['a']), float(tri['b']), float(tri['c']),
+                                      ancho, alto)
+    pts = {'A': (Ax, Ay), 'B': (Bx, By), 'C': (Cx, Cy)}
+
+    partes = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{ancho}" height="{alto}" '
+        f'viewBox="0 0 {ancho} {alto}">',
+        f'<rect width="{ancho}" height="{alto}" fill="white"/>',
+        f'<polygon points="{Bx:.1f},{By:.1f} {Cx:.1f},{Cy:.1f} {Ax:.1f},{Ay:.1f}" '
+        f'fill="#f0f7ff" stroke="black" stroke-width="2"/>',
+    ]
+
+    # mismas posiciones que _draw_labels
+    for label, (x, y) in pts.items():
+        partes.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="black"/>')
+        tx = x + 12 if x + 60 < ancho else x - 12
+        ty = y - 8 if y - 20 > 0 else y + 12
+        partes.append(_texto(tx, ty, label,
+                             'font-family="Arial" font-size="12pt" font-weight="bold"'))
+
+    side_points = {'a': ('B','C'), 'b': ('A','C'), 'c': ('A','B')}
+    for side in ['a','b','c']:
+        p1, p2 = pts[side_points[side][0]], pts[side_points[side][1]]
+        mx, my = (p1[0]+p2[0])/2, (p1[1]+p2[1])/2
+        ty = my - 10 if my > 20 else my + 10
+        if side in known:
+            txt, color = f"{side} = {known[side]:.3f}", "black"
+        elif solucion:
+            txt, color = f"{side} = {tri[side]:.3f}", "#c00000"
+        else:
+            txt, color = f"{side} = ?", "black"
+        partes.append(_texto(mx, ty, txt,
+                             'font-family="Arial" font-size="10pt" font-style="italic"', color))
+
+    for ang in ['A','B','C']:
+        x, y = pts[ang]
+        tx = x - 15 if x > 30 else x + 15
+        ty = y - 20 if y > 30 else y + 15
+        if ang in known:
+            txt, color = f"{ang} = {known[ang]:.2f}°", "black"
+        elif solucion:
+            txt, color = f"{ang} = {tri[ang]:.2f}°", "#c00000"
+        else:
+            txt, color = f"{ang} = ?", "black"
+        partes.append(_texto(tx, ty, txt, 'font-family="Arial" font-size="9pt"', color))
+
+    if pie:
+        partes.append(f'<text x="8" y="{alto - 8}" font-family="monospace" font-size="8pt" '
+                      f'fill="#808080">{pie}</text>')
+    partes.append('</svg>')
+    return "\n".join(partes)
+
+def svg_desde_id(id_ejercicio, solucion=False, ancho=ANCHO, alto=ALTO):
+    tri, known, _ = ejercicio_desde_id(id_ejercicio)
+    return svg_ejercicio(tri, known, ancho, alto, solucion, pie=id_a_texto(id_ejercicio))
+
+# --------------------------
+# Muchos ejercicios
+# --------------------------
+def ids_ejercicios(n, tipo="aleatorio", modo_index=1, scale=1.0, rng=None):
+    rng = rng or random
+    return [crear_id(rng.getrandbits(64), tipo, modo_index, scale) for _ in range(n)]
+
+def _bloque_archivos(args):
+    # escribe un .svg por ejercicio; devuelve cuántos escribió
+    inicio, ids, solucion, directorio = args
+    for i, id_ejercicio in enumerate(ids, inicio):
+        ruta = os.path.join(directorio, f"{i:06d}_{id_a_texto(id_ejercicio)}.svg")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(svg_desde_id(id_ejercicio, solucion))
+    return len(ids)
+
+def _bloque_documento(args):
+    _, ids, solucion, _ = args
+    return [svg_desde_id(i, solucion) for i in ids]
+
+def _bloques(ids, solucion, directorio, bloque):
+    for inicio in range(0, len(ids), bloque):
+        yield inicio, ids[inicio:inicio + bloque], solucion, directorio
+
+def _en_orden(trabajo, tareas, procesos):
+    # resultados por bloque en el orden de los IDs; con varios procesos solo hay
+    # 2 bloques por proceso en vuelo, así la memoria no crece con n
+    if procesos == 1:
+        for t in tareas:
+            yield trabajo(t)
+        return
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        en_vuelo = []
+        for t in tareas:
+            en_vuelo.append(pool.submit(trabajo, t))
+            if len(en_vuelo) >= 2 * procesos:
+                yield en_vuelo.pop(0).result()
+        for fut in en_vuelo:
+            yield fut.result()
+
+def escribir_archivos(ids, directorio, solucion=False, procesos=None, bloque=BLOQUE):
+    procesos = procesos or os.cpu_count() or 1
+    os.makedirs(directorio, exist_ok=True)
+    tareas = _bloques(ids, solucion, directorio, bloque)
+    return sum(_en_orden(_bloque_archivos, tareas, procesos))
+
+def escribir_documento(ids, salida, solucion=False, procesos=None, bloque=BLOQUE):
+    # un HTML con un SVG por página (se imprime directo desde el navegador)
+    procesos = procesos or os.cpu_count() or 1
+    titulo = "Clave de respuestas" if solucion else "Hoja de ejercicios"
+    salida.write('<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+                 f'<title>{titulo}</title>\n<style>'
+                 '.pagina{page-break-after:always;break-after:page;text-align:center}'
+                 '</style></head><body>\n')
+    n = 0
+    tareas = _bloques(ids, solucion, None, bloque)
+    for dibujos in _en_orden(_bloque_documento, tareas, procesos):
+        for d in dibujos:
+            n += 1
+            salida.write(f'<div class="pagina"><p>{titulo} — ejercicio {n}</p>\n{d}\n</div>\n')
+    salida.write('</body></html>\n')
+    return n
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Dibuja ejercicios de triángulos como SVG.")
+    p.add_argument("-n", type=int, default=100, help="cantidad de ejercicios")
+    p.add_argument("--tipo", choices=TIPOS, default="aleatorio")
+    p.add_argument("--modo", type=int, choices=range(len(MODOS)), default=1,
+                   help="índice en MODOS")
+    p.add_argument("--scale", type=float, default=1.0)
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--clave", action="store_true", help="muestra las medidas ocultas")
+    p.add_argument("--procesos", type=int, default=None)
+    p.add_argument("-o", "--directorio", default="svg", help="un .svg por ejercicio")
+    p.add_argument("--documento", default=None, help="un solo HTML en lugar de archivos")
+    args = p.parse_args(argv)
+
+    ids = ids_ejercicios(args.n, args.tipo, args.modo, args.scale, random.Random(args.seed))
+    if args.documento:
+        with open(args.documento, "w", encoding="utf-8") as f:
+            n = escribir_documento(ids, f, args.clave, args.procesos)
+        print(f"{n} ejercicios en {args.documento}")
+    else:
+        n = escribir_archivos(ids, args.directorio, args.clave, args.procesos)
+        print(f"{n} ejercicios en {args.directorio}/")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+disposicion.py
+Ubicación de los vértices de un triángulo dentro de una caja (canvas, hoja SVG).
+Misma construcción que usaba _draw_triangle: base BC horizontal y centrada abajo,
+A arriba en la intersección de los círculos de radio c (desde B) y b (desde C).
+Funciona para uno o para muchos triángulos y guarda en caché los resultados por
+(a, b, c, ancho, alto, margen).
+"""
+
+import math
+
+MARGEN = 40
+TAMANO_CACHE = 4096
+
+_cache = {}
+
+# --------------------------
+# Un triángulo
+# --------------------------
+def _calcular(a, b, c, ancho, alto, margen):
+    # escala para que el lado más largo quepa en la caja, con 10% de aire
+    max_side = max(a, b, c)
+    if max_side == 0:
+        escala = 1.0
+    else:
+        escala = min((ancho - 2*margen) / max_side,
+                     (alto - 2*margen) / max_side) * 0.9
+
+    a_len = a * escala   # BC en píxeles
+    b_len = b * escala   # AC (radio desde C hasta A)
+    c_len = c * escala   # AB (radio desde B hasta A)
+
+    # base BC horizontal, centrada hacia abajo
+    Bx = (ancho - a_len) / 2
+    By = alto - margen
+    Cx = Bx + a_len
+    Cy = By
+
+    # proteger contra a_len == 0
+    d = a_len if a_len != 0 else 1e-6
+
+    # x_proj = distancia desde B a la proyección de A sobre BC (ley de cosenos)
+    x_proj = (c_len*c_len - b_len*b_len + d*d) / (2*d)
+    tmp = c_len*c_len - x_proj*x_proj
+    if tmp < 0:
+        # ajuste numérico (evita NaN)
+        tmp = 0.0
+    y_alt = math.sqrt(tmp)
+
+    # A hacia arriba de la base (restar en Y es subir en pantalla)
+    Ax = Bx + x_proj
+    Ay = By - y_alt
+
+    # fallback si sale infinito/NaN
+    if not (math.isfinite(Ax) and math.isfinite(Ay)):
+        Ax = Bx + d/2
+        Ay = By - max(40, max(b_len, c_len)/2)
+
+    return Ax, Ay, Bx, By, Cx, Cy
+
+def _guardar(clave, valor):
+    if len(_cache) >= TAMANO_CACHE:
+        # se descarta la entrada más vieja (los dict mantienen el orden de inserción)
+        del _cache[next(iter(_cache))]
+    _cache[clave] = valor
+
+def vertices(a, b, c, ancho, alto, margen=MARGEN):
+    # devuelve (Ax, Ay, Bx, By, Cx, Cy)
+    clave = (a, b, c, ancho, alto, margen)
+    r = _cache.get(clave)
+    if r is None:
+        r = _calcular(a, b, c, ancho, alto, margen)
+        _guardar(clave, r)
+    return r
+
+# --------------------------
+# Muchos triángulos
+# --------------------------
+def vertices_lote(a, b, c, ancho, alto, margen=MARGEN):
+    # a, b, c: listas (o columnas de BancoTriangulos) del mismo largo;
+    # devuelve una lista de (Ax, Ay, Bx, By, Cx, Cy), en el mismo orden
+    # en lotes grandes la caché solo se llena hasta TAMANO_CACHE: ir descartando
+    # entradas viejas por cada triángulo costaría más que calcularlo
+    cache_get = _cache.get
+    salida = []
+    agregar = salida.append
+    for x, y, z in zip(a, b, c):
+        clave = (x, y, z, ancho, alto, margen)
+        r = cache_get(clave)
+        if r is None:
+            r = _calcular(x, y, z, ancho, alto, margen)
+            if len(_cache) < TAMANO_CACHE:
+                _cache[clave] = r
+        agregar(r)
+    return salida
+
+def limpiar_cache():
+    _cache.clear()
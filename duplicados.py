@@ -0,0 +1,103 @@
+"""
+duplicados.py
+Índice de ejercicios ya entregados (por sesión o por curso) para no repetir
+casi el mismo triángulo. Cada triángulo se resume en una huella: ángulos
+normalizados (A, B, C)/180 y lados relativos al perímetro. Dos triángulos son
+casi iguales si todas las coordenadas de la huella difieren menos que `distancia`.
+
+Hash espacial: celdas de lado `distancia` sobre A/180 y B/180. Un casi-duplicado
+difiere menos que `distancia` en esas dos coordenadas, así que cae en la misma
+celda o en una de las 8 vecinas; cada consulta revisa 9 celdas con pocos puntos
+cada una, O(1) amortizado aunque el índice tenga cientos de miles de ejercicios.
+"""
+
+import math, os
+from array import array
+
+from triangulos import generar_triangulo
+
+DISTANCIA = 0.01   # 1.8° en los ángulos, 1% del perímetro en los lados
+INTENTOS = 200
+VARIABLE = "TRIANGULOS_SIN_REPETIR"
+
+def huella(tri):
+    p = tri['a'] + tri['b'] + tri['c']
+    return (tri['A'] / 180, tri['B'] / 180, tri['C'] / 180,
+            tri['a'] / p, tri['b'] / p, tri['c'] / p)
+
+def sin_repetir_desde_entorno():
+    # TRIANGULOS_SIN_REPETIR=1: las apps no muestran dos veces casi el mismo triángulo
+    return os.environ.get(VARIABLE, "") not in ("", "0")
+
+class IndiceEjercicios:
+    def __init__(self, distancia=DISTANCIA):
+        if distancia <= 0:
+            raise ValueError("la distancia tiene que ser positiva")
+        self.distancia = distancia
+        self.celdas = {}   # (i, j) -> lista de huellas
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    def _celda(self, h):
+        d = self.distancia
+        return math.floor(h[0] / d), math.floor(h[1] / d)
+
+    def _cercano(self, h):
+        d = self.distancia
+        ci, cj = self._celda(h)
+        A, B, C, a, b, c = h
+        for i in (ci - 1, ci, ci + 1):
+            for j in (cj - 1, cj, cj + 1):
+                for oA, oB, oC, oa, ob, oc in self.celdas.get((i, j), ()):
+                    if (abs(A - oA) < d and abs(B - oB) < d and abs(C - oC) < d
+                            and abs(a - oa) < d and abs(b - ob) < d and abs(c - oc) < d):
+                        return True
+        return False
+
+    def _registrar(self, h):
+        self.celdas.setdefault(self._celda(h), []).append(h)
+        self.n += 1
+
+    def es_nuevo(self, tri):
+        return not self._cercano(huella(tri))
+
+    def agregar(self, tri):
+        # registra el triángulo si no hay otro casi igual; devuelve si lo registró
+        h = huella(tri)
+        if self._cercano(h):
+            return False
+        self._registrar(h)
+        return True
+
+    def generar(self, tipo="aleatorio", scale=1.0, rng=None, intentos=INTENTOS):
+        # como generar_triangulo, pero descarta los casi-duplicados del índice
+        for _ in range(intentos):
+            tri = generar_triangulo(tipo, scale, rng)
+            if self.agregar(tri):
+                return tri
+        raise RuntimeError(f"no quedan triángulos '{tipo}' nuevos a distancia {self.distancia} "
+                           f"({self.n} entregados)")
+
+    # --------------------------
+    # Índice por curso en disco
+    # --------------------------
+    def guardar(self, ruta):
+        # distancia y después 6 doubles por huella
+        datos = array('d', [self.distancia])
+        for huellas in self.celdas.values():
+            for h in huellas:
+                datos.extend(h)
+        with open(ruta, "wb") as f:
+            datos.tofile(f)
+
+    @classmethod
+    def cargar(cls, ruta):
+        datos = array('d')
+        with open(ruta, "rb") as f:
+            datos.frombytes(f.read())
+        indice = cls(datos[0])
+        for o in range(1, len(datos), 6):
+            indice._registrar(tuple(datos[o:o+6]))
+        return indice
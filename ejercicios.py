@@ -0,0 +1,53 @@
+"""
+ejercicios.py
+Ejercicios identificados por un ID compacto de 16 bytes:
+(semilla, tipo, modo_index, scale). Con el ID cualquier proceso vuelve a
+generar el mismo triángulo y la misma separación de seleccionar_medidas,
+sin guardar las seis medidas.
+
+Formato: semilla uint64 | tipo uint8 | modo uint8 | 2 bytes de relleno | scale float32
+(scale se guarda como float32: el triángulo siempre se genera con el valor leído del ID).
+"""
+
+import random, struct
+
+from triangulos import MODOS, TIPOS, generar_triangulo, seleccionar_medidas
+
+FORMATO_ID = struct.Struct("<QBBxxf")
+TAMANO_ID = FORMATO_ID.size  # 16
+
+# --------------------------
+# IDs
+# --------------------------
+def crear_id(semilla, tipo="aleatorio", modo_index=1, scale=1.0):
+    if not 0 <= modo_index < len(MODOS):
+        raise ValueError(f"modo_index fuera de rango: {modo_index}")
+    return FORMATO_ID.pack(semilla, TIPOS.index(tipo), modo_index, scale)
+
+def nuevo_id(tipo="aleatorio", modo_index=1, scale=1.0, rng=None):
+    rng = rng or random
+    return crear_id(rng.getrandbits(64), tipo, modo_index, scale)
+
+def leer_id(id_ejercicio):
+    # devuelve (semilla, tipo, modo_index, scale)
+    semilla, i_tipo, modo_index, scale = FORMATO_ID.unpack(id_ejercicio)
+    return semilla, TIPOS[i_tipo], modo_index, scale
+
+def id_a_texto(id_ejercicio):
+    return id_ejercicio.hex()
+
+def id_desde_texto(texto):
+    return bytes.fromhex(texto)
+
+# --------------------------
+# Regenerar ejercicios
+# --------------------------
+def triangulo_desde_id(id_ejercicio):
+    semilla, tipo, _, scale = leer_id(id_ejercicio)
+    return generar_triangulo(tipo, scale, random.Random(semilla))
+
+def ejercicio_desde_id(id_ejercicio):
+    # devuelve (tri, known, unknown) igual que generar_triangulo + seleccionar_medidas
+    tri = triangulo_desde_id(id_ejercicio)
+    known, unknown = seleccionar_medidas(tri, leer_id(id_ejercicio)[2])
+    return tri, known, unknown
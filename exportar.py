@@ -0,0 +1,173 @@
+"""
+exportar.py
+Exporta ejercicios (triángulo + medidas conocidas/ocultas) como JSONL o CSV.
+Los registros salen de un generador y se escriben de a uno, así que la memoria
+no crece con la cantidad de filas.
+
+Uso:
+    python exportar.py -n 1000 --tipo agudo --modo 1 --formato csv -o hoja.csv
+    python exportar.py -n 500 --indice curso.idx -o semana3.jsonl   # sin repetir lo ya entregado
+    python exportar.py -n 1420 --cobertura -o cubre.jsonl           # todas las celdas x todos los modos
+"""
+
+import argparse, csv, json, os, random, sys
+
+from banco import Banco
+from cobertura import PASO, generar_estratificado
+from duplicados import DISTANCIA, INTENTOS, IndiceEjercicios
+from resolver import filtro_ssa
+from triangulos import CLAVES, MODOS, TIPOS, generar_triangulos, seleccionar_medidas
+
+BLOQUE = 10_000
+
+# --------------------------
+# Generador de ejercicios
+# --------------------------
+def ejercicios(n, tipo="aleatorio", modo_index=1, scale=1.0, rng=None, bloque=BLOQUE,
+               indice=None, banco=None, filtro=None):
+    # se genera por bloques con generar_triangulos y se entrega de a un ejercicio;
+    # con indice (duplicados.IndiceEjercicios) se saltan los casi-duplicados y con
+    # banco (banco.Banco) los triángulos se sortean del banco en vez de generarse;
+    # filtro(cols) -> cols (p. ej. resolver.filtro_ssa) descarta filas de cada bloque
+    hechos = 0
+    # casi-duplicados seguidos; con la misma semilla que una corrida anterior se
+    # rechaza todo lo ya entregado antes de llegar a triángulos nuevos, por eso el
+    # límite crece con el índice
+    rechazados = 0
+    while hechos < n:
+        m = min(bloque, n - hechos)
+        if banco is None:
+            cols = generar_triangulos(m, tipo, scale, rng)
+        else:
+            cols = banco.sortear_lote(m, tipo, rng)
+        if filtro is not None:
+            cols = filtro(cols)
+            if not cols['a']:
+                raise RuntimeError(f"el filtro no deja ningún triángulo '{tipo}'")
+        for fila in zip(*(cols[k] for k in CLAVES)):
+            tri = dict(zip(CLAVES, fila))
+            if indice is not None and not indice.agregar(tri):
+                rechazados += 1
+                if rechazados >= INTENTOS + len(indice):
+                    raise RuntimeError(f"no quedan triángulos '{tipo}' nuevos en el índice "
+                                       f"({len(indice)} entregados)")
+                continue
+            rechazados = 0
+            known, unknown = seleccionar_medidas(tri, modo_index)
+            yield {"tipo": tipo, "modo": modo_index, "tri": tri,
+                   "known": known, "unknown": unknown}
+            hechos += 1
+
+def ejercicios_cubriendo(n, tipo="aleatorio", scale=1.0, rng=None, paso=PASO):
+    # como ejercicios, pero estratificado por (celda de ángulos, modo): cada
+    # registro trae su propio modo (ver cobertura.py)
+    cols = generar_estratificado(n, tipo, scale, rng, paso)
+    for *fila, modo in zip(*(cols[k] for k in CLAVES), cols["modo"]):
+        tri = dict(zip(CLAVES, fila))
+        known, unknown = seleccionar_medidas(tri, modo)
+        yield {"tipo": tipo, "modo": modo, "tri": tri, "known": known, "unknown": unknown}
+
+# --------------------------
+# Formatos de salida
+# --------------------------
+def escribir_jsonl(registros, salida):
+    for r in registros:
+        salida.write(json.dumps(r, ensure_ascii=False))
+        salida.write("\n")
+
+def escribir_csv(registros, salida):
+    w = csv.writer(salida)
+    w.writerow(["tipo", "modo", *CLAVES, "conocidas", "ocultas"])
+    for r in registros:
+        tri = r["tri"]
+        w.writerow([r["tipo"], r["modo"]] + [tri[k] for k in CLAVES]
+                   + [" ".join(r["known"]), " ".join(r["unknown"])])
+
+FORMATOS = {"jsonl": escribir_jsonl, "csv": escribir_csv}
+
+def con_avance(registros, n, avance, cada=BLOQUE):
+    # pasa los registros tal cual y cada `cada` llama avance(hechos, n)
+    # (trabajos.Trabajo lo usa para la barra de progreso y para cancelar)
+    hechos = 0
+    for r in registros:
+        yield r
+        hechos += 1
+        if hechos % cada == 0:
+            avance(hechos, n)
+    avance(hechos, n)
+
+def exportar_hoja(ruta, n, tipo="aleatorio", modo_index=1, formato="jsonl", seed=None,
+                  avance=None):
+    # una hoja completa a un archivo; devuelve la ruta
+    registros = ejercicios(n, tipo, modo_index, rng=random.Random(seed))
+    if avance is not None:
+        registros = con_avance(registros, n, avance, cada=min(BLOQUE, max(1, n // 100)))
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        FORMATOS[formato](registros, f)
+    return ruta
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Exporta ejercicios de triángulos.")
+    p.add_argument("-n", type=int, default=100, help="cantidad de ejercicios")
+    p.add_argument("--tipo", choices=TIPOS, default="aleatorio")
+    p.add_argument("--modo", type=int, choices=range(len(MODOS)), default=1,
+                   help="índice en MODOS")
+    p.add_argument("--scale", type=float, default=1.0)
+    p.add_argument("--formato", choices=FORMATOS, default="jsonl")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("-o", "--salida", default="-", help="archivo de salida (- = stdout)")
+    p.add_argument("--distancia", type=float, default=None,
+                   help="descarta ejercicios casi iguales a otro a esta distancia")
+    p.add_argument("--indice", default=None,
+                   help="índice del curso: se carga si existe y se guarda al terminar")
+    p.add_argument("--banco", default=None, help="sortear de un banco de banco.py")
+    p.add_argument("--ssa", choices=["unica", "ambigua"], default=None,
+                   help="solo triángulos cuyo SSA (a, b, A) tenga esa cantidad de soluciones")
+    p.add_argument("--cobertura", action="store_true",
+                   help="repartir por igual entre celdas de ángulos y todos los modos (ignora --modo)")
+    p.add_argument("--paso", type=float, default=PASO, help="lado de la celda para --cobertura")
+    args = p.parse_args(argv)
+    if args.banco and args.scale != 1.0:
+        p.error("--scale no se aplica a --banco: la escala se elige al construir el banco")
+    if args.cobertura and (args.banco or args.ssa or args.indice or args.distancia is not None):
+        p.error("--cobertura no se combina con --banco, --ssa, --indice ni --distancia")
+    if args.distancia is not None and args.distancia <= 0:
+        p.error("--distancia tiene que ser positiva")
+
+    indice = None
+    if args.indice and os.path.exists(args.indice):
+        indice = IndiceEjercicios.cargar(args.indice)
+        # el índice guarda su distancia: cambiarla mezclaría celdas de otro tamaño
+        if args.distancia is not None and args.distancia != indice.distancia:
+            p.error(f"{args.indice} usa --distancia {indice.distancia}, no {args.distancia}")
+    elif args.indice or args.distancia is not None:
+        indice = IndiceEjercicios(DISTANCIA if args.distancia is None else args.distancia)
+
+    rng = random.Random(args.seed)
+    banco = Banco(args.banco) if args.banco else None
+    if banco and banco.cantidad(args.tipo) == 0:
+        p.error(f"{args.banco} no tiene triángulos '{args.tipo}'; tiene: "
+                + (", ".join(banco.tipos()) or "ninguno"))
+    filtro = filtro_ssa(args.ssa) if args.ssa else None
+    if args.cobertura:
+        registros = ejercicios_cubriendo(args.n, args.tipo, args.scale, rng, args.paso)
+    else:
+        registros = ejercicios(args.n, args.tipo, args.modo, args.scale, rng, indice=indice,
+                               banco=banco, filtro=filtro)
+    escribir = FORMATOS[args.formato]
+
+    try:
+        if args.salida == "-":
+            escribir(registros, sys.stdout)
+        else:
+            with open(args.salida, "w", encoding="utf-8", newline="") as f:
+                escribir(registros, f)
+    except RuntimeError as e:
+        p.exit(1, f"exportar.py: {e}\n")
+    finally:
+        # también si se cortó a mitad: lo ya escrito quedó entregado
+        if args.indice:
+            indice.guardar(args.indice)
+
+if __name__ == "__main__":
+    main()
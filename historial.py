@@ -0,0 +1,160 @@
+"""
+historial.py
+Registro en SQLite de cada intento corregido (verificar_respuestas, /verificar):
+triángulo, qué medidas se mostraron y cuáles se pidieron, lo que contestó el
+alumno y si cada medida estuvo bien.
+
+registrar() solo deja el intento en una cola; un hilo aparte es el dueño de la
+conexión y escribe por lotes (una transacción cada LOTE intentos o INTERVALO
+segundos) con la base en modo WAL, así corregir nunca espera al disco y las
+consultas pueden leer mientras se escribe.
+
+Uso (consultas):
+    python historial.py intentos.db --alumno ana
+    python historial.py intentos.db --por-modo
+"""
+
+import argparse, json, os, queue, sqlite3, threading, time
+
+from triangulos import CLAVES, claves_de, mascara   # mismos bits que TABLA_MODOS
+
+LOTE = 500
+INTERVALO = 0.5
+VARIABLE = "TRIANGULOS_HISTORIAL"
+
+# las columnas de SQLite no distinguen mayúsculas: a/A van como lado_a/ang_A
+COLUMNAS_TRI = ("lado_a", "lado_b", "lado_c", "ang_A", "ang_B", "ang_C")
+
+ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS intentos (
+    id INTEGER PRIMARY KEY,
+    momento REAL NOT NULL,
+    alumno TEXT,
+    id_ejercicio BLOB,
+    tipo TEXT,
+    modo INTEGER,
+    {", ".join(f"{c} REAL" for c in COLUMNAS_TRI)},
+    conocidas INTEGER NOT NULL,
+    pedidas INTEGER NOT NULL,
+    acertadas INTEGER NOT NULL,
+    correctos INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    respuestas TEXT
+);
+CREATE INDEX IF NOT EXISTS intentos_alumno ON intentos (alumno, momento);
+-- cubre resumen_por_modo: se resuelve sin leer la tabla
+CREATE INDEX IF NOT EXISTS intentos_modo ON intentos (modo, momento, correctos, total);
+"""
+
+INSERTAR = (f"INSERT INTO intentos (momento, alumno, id_ejercicio, tipo, modo, "
+            f"{', '.join(COLUMNAS_TRI)}, conocidas, pedidas, acertadas, correctos, total, "
+            f"respuestas) VALUES ({', '.join('?' * (11 + len(COLUMNAS_TRI)))})")
+
+def abrir(ruta):
+    con = sqlite3.connect(ruta)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.executescript(ESQUEMA)
+    return con
+
+# --------------------------
+# Escritura por lotes
+# --------------------------
+class Historial:
+    def __init__(self, ruta, lote=LOTE, intervalo=INTERVALO):
+        self.ruta = ruta
+        self.lote = lote
+        self.intervalo = intervalo
+        self.cola = queue.SimpleQueue()
+        self.escritos = 0
+        self.error = None   # último error de escritura, si hubo
+        # el esquema se crea acá para que un error de ruta salte al abrir y no en el hilo
+        abrir(ruta).close()
+        self._hilo = threading.Thread(target=self._escribir, daemon=True)
+        self._hilo.start()
+
+    def registrar(self, tri, known, estados, respuestas, alumno=None, id_ejercicio=None,
+                  tipo=None, modo=None):
+        # estados: {medida pedida: "correcto"/"incorrecto"/"vacio"/"invalido"}
+        # respuestas: {medida pedida: texto que escribió el alumno}
+        acertadas = [k for k, e in estados.items() if e == "correcto"]
+        self.cola.put((time.time(), alumno, id_ejercicio, tipo, modo,
+                       *(float(tri[k]) for k in CLAVES),
+                       mascara(known), mascara(estados), mascara(acertadas),
+                       len(acertadas), len(estados),
+                       json.dumps(respuestas, ensure_ascii=False)))
+
+    def _escribir(self):
+        con = abrir(self.ruta)
+        pendientes = []
+        fin = False
+        while not fin:
+            limite = time.monotonic() + self.intervalo
+            while len(pendientes) < self.lote:
+                try:
+                    fila = self.cola.get(timeout=max(0.0, limite - time.monotonic()))
+                except queue.Empty:
+                    break
+                if fila is None:
+                    fin = True
+                    break
+                pendientes.append(fila)
+            if pendientes:
+                try:
+                    with con:
+                        con.executemany(INSERTAR, pendientes)
+                    self.escritos += len(pendientes)
+                except sqlite3.Error as e:
+                    # el lote se pierde pero el hilo sigue: quien corrige nunca se traba
+                    self.error = e
+                pendientes.clear()
+        con.close()
+
+    def cerrar(self):
+        # escribe lo que quede en la cola y espera al hilo
+        self.cola.put(None)
+        self._hilo.join()
+
+def historial_desde_entorno():
+    # TRIANGULOS_HISTORIAL=ruta.db: las apps guardan cada intento ahí
+    ruta = os.environ.get(VARIABLE)
+    return Historial(ruta) if ruta else None
+
+# --------------------------
+# Consultas
+# --------------------------
+def intentos_de(con, alumno, limite=50):
+    filas = con.execute(
+        "SELECT momento, tipo, modo, pedidas, acertadas, respuestas FROM intentos "
+        "WHERE alumno = ? ORDER BY momento DESC LIMIT ?", (alumno, limite))
+    return [{"momento": m, "tipo": t, "modo": modo, "pedidas": claves_de(p),
+             "acertadas": claves_de(a), "respuestas": json.loads(r)}
+            for m, t, modo, p, a, r in filas]
+
+def resumen_por_modo(con, desde=0.0):
+    # {modo: (intentos, perfectos, medidas acertadas, medidas pedidas)}
+    filas = con.execute(
+        "SELECT modo, COUNT(*), SUM(correctos = total), SUM(correctos), SUM(total) "
+        "FROM intentos WHERE modo IS NOT NULL AND momento >= ? GROUP BY modo", (desde,))
+    return {modo: tuple(resto) for modo, *resto in filas}
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Consultas sobre el historial de intentos.")
+    p.add_argument("ruta")
+    p.add_argument("--alumno", default=None)
+    p.add_argument("--por-modo", action="store_true")
+    p.add_argument("--limite", type=int, default=50)
+    args = p.parse_args(argv)
+
+    con = abrir(args.ruta)
+    if args.alumno is not None:
+        for intento in intentos_de(con, args.alumno, args.limite):
+            print(json.dumps(intento, ensure_ascii=False))
+    if args.por_modo:
+        for modo, (n, perfectos, bien, pedidas) in sorted(resumen_por_modo(con).items()):
+            print(f"modo {modo}: {n} intentos, {perfectos} perfectos, "
+                  f"{bien}/{pedidas} medidas correctas")
+    con.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+medicion.py
+Medición opcional de tiempos de la interfaz: cuántas veces se llama cada método
+de TriangulosApp y cuánto tarda (percentiles). Apagada no cuesta nada porque los
+métodos ni siquiera se envuelven.
+
+Se enciende con TRIANGULOS_MEDIR=1 (o medir=True en TriangulosApp);
+TRIANGULOS_MEDIR=ruta.json además elige el archivo donde se vuelca al salir.
+
+Cantidad, total y máximo son exactos; los percentiles salen de una muestra
+uniforme de a lo sumo MUESTRAS llamadas por método, así una sesión larga no
+acumula memoria ni ordena cada vez más tiempos al refrescar la tabla de F2.
+"""
+
+import functools, json, os, random, time
+from array import array
+
+METODOS = ("nuevo_triangulo", "draw", "_draw_triangle", "_draw_labels",
+           "_update_info_panel", "mostrar_pista", "verificar_respuestas")
+ARCHIVO = "tiempos_ui.json"
+VARIABLE = "TRIANGULOS_MEDIR"
+MUESTRAS = 2048
+REFRESCO_MS = 500   # cada cuánto se actualiza la tabla de F2
+
+def percentiles(tiempos, ps=(50, 95, 99)):
+    # tiempos en segundos -> {p: milisegundos}
+    t = sorted(tiempos)
+    return {p: t[min(len(t) - 1, int(len(t) * p / 100))] * 1000 for p in ps}
+
+class Tiempos:
+    # duraciones de un método; la muestra es un reservoir: la llamada n reemplaza
+    # un lugar al azar con probabilidad tamano/n
+    def __init__(self, tamano=MUESTRAS, rng=None):
+        self.tamano = tamano
+        self.muestra = array('d')
+        self.n = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self._azar = (rng or random.Random()).random
+
+    def agregar(self, t):
+        self.n += 1
+        self.total += t
+        if t > self.maximo:
+            self.maximo = t
+        if len(self.muestra) < self.tamano:
+            self.muestra.append(t)
+        else:
+            j = int(self._azar() * self.n)
+            if j < self.tamano:
+                self.muestra[j] = t
+
+class Medidor:
+    def __init__(self, ruta=ARCHIVO):
+        self.ruta = ruta
+        self.tiempos = {}   # nombre -> Tiempos
+
+    def envolver(self, nombre, fn):
+        agregar = self.tiempos.setdefault(nombre, Tiempos()).agregar
+        reloj = time.perf_counter
+
+        @functools.wraps(fn)
+        def medido(*args, **kwargs):
+            t0 = reloj()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                agregar(reloj() - t0)
+        return medido
+
+    def instrumentar(self, obj, nombres=METODOS):
+        # reemplaza los métodos en la instancia; los que la clase no tiene se saltan
+        for nombre in nombres:
+            fn = getattr(obj, nombre, None)
+            if fn is not None:
+                setattr(obj, nombre, self.envolver(nombre, fn))
+
+    def resumen(self):
+        salida = {}
+        for nombre, t in self.tiempos.items():
+            if not t.n:
+                continue
+            p = percentiles(t.muestra)
+            salida[nombre] = {"llamadas": t.n, "total_ms": t.total * 1000,
+                              "p50_ms": p[50], "p95_ms": p[95], "p99_ms": p[99],
+                              "max_ms": t.maximo * 1000}
+        return salida
+
+    def texto(self):
+        # tabla corta para mostrar encima del canvas
+        lineas = [f"{'método':<21}{'n':>6}{'p50':>8}{'p95':>8}{'p99':>8}  (ms)"]
+        for nombre, r in self.resumen().items():
+            lineas.append(f"{nombre:<21}{r['llamadas']:>6}{r['p50_ms']:>8.2f}"
+                          f"{r['p95_ms']:>8.2f}{r['p99_ms']:>8.2f}")
+        return "\n".join(lineas)
+
+    def volcar(self, ruta=None):
+        with open(ruta or self.ruta, "w", encoding="utf-8") as f:
+            json.dump(self.resumen(), f, indent=2)
+            f.write("\n")
+
+class Estadisticas:
+    # tabla de texto() encima del canvas de una app; F2 la prende y la apaga y
+    # mientras se ve se refresca cada refresco_ms con master.after
+    def __init__(self, master, canvas, medidor, refresco_ms=REFRESCO_MS):
+        self.master = master
+        self.canvas = canvas
+        self.medidor = medidor
+        self.refresco_ms = refresco_ms
+        self.visible = False
+        self._item = None
+        self._texto = None
+        self._after = None
+        master.bind("<F2>", self.alternar)
+
+    def alternar(self, event=None):
+        self.visible = not self.visible
+        if self.visible:
+            self._refrescar()
+            return
+        if self._after:
+            self.master.after_cancel(self._after)
+            self._after = None
+        self.canvas.itemconfigure(self._item, state="hidden")
+
+    def _refrescar(self):
+        texto = self.medidor.texto()
+        if self._item is None:
+            self._item = self.canvas.create_text(8, 8, text=texto, anchor="nw",
+                                                 font=("Courier", 8), fill="#404040")
+        elif texto != self._texto:
+            self.canvas.itemconfigure(self._item, text=texto)
+        self._texto = texto
+        self.canvas.itemconfigure(self._item, state="normal")
+        self.canvas.tag_raise(self._item)
+        self._after = self.master.after(self.refresco_ms, self._refrescar)
+
+def medidor_para(medir=None):
+    # medir=None: decide la variable de entorno; devuelve un Medidor o None
+    valor = os.environ.get(VARIABLE, "")
+    if medir is None:
+        medir = valor not in ("", "0")
+    if not medir:
+        return None
+    return Medidor(valor if valor not in ("", "0", "1") else ARCHIVO)
@@ -0,0 +1,86 @@
+"""
+precarga.py
+Cola de triángulos preparados en un hilo aparte, para que "Nuevo triángulo"
+solo tenga que sacar uno y dibujarlo. Cada elemento ya trae la separación
+known/unknown de seleccionar_medidas para el tipo y modo actuales.
+"""
+
+import queue, random, sys, threading, traceback
+
+from triangulos import generar_triangulo, seleccionar_medidas
+
+TAMANO_COLA = 32
+
+class Precarga:
+    def __init__(self, tipo="aleatorio", modo_index=1, tamano=TAMANO_COLA, rng=None,
+                 generar=generar_triangulo):
+        # generar(tipo, rng=...): generar_triangulo o Banco.sortear
+        self.generar = generar
+        self.cola = queue.Queue(maxsize=tamano)
+        # (tipo, modo_index, generación): la generación sube cada vez que cambia la
+        # configuración y los elementos de generaciones viejas se descartan
+        self.config = (tipo, modo_index, 0)
+        self.error = None   # último error del hilo, como texto
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        # el hilo usa su propio Random para no tocar el estado global de random
+        self._rng = rng or random.Random()
+        self._hilo = threading.Thread(target=self._producir, daemon=True)
+        self._hilo.start()
+
+    def _producir(self):
+        while not self._parar.is_set():
+            tipo, modo_index, gen = self.config
+            try:
+                tri = self.generar(tipo, rng=self._rng)
+                known, unknown = seleccionar_medidas(tri, modo_index)
+            except Exception:
+                # el hilo no se muere: avisa y espera otra configuración; mientras
+                # tanto obtener() genera en el hilo de la interfaz, donde el error se ve
+                self.error = traceback.format_exc()
+                print(f"precarga: falló generar '{tipo}'\n{self.error}", file=sys.stderr)
+                while not self._parar.is_set() and self.config[2] == gen:
+                    self._parar.wait(0.1)
+                continue
+            item = (gen, tri, known, unknown)
+            # con la cola llena se espera de a poco para notar cambios de config o cierre
+            while not self._parar.is_set() and self.config[2] == gen:
+                try:
+                    self.cola.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    def _vaciar(self):
+        while True:
+            try:
+                self.cola.get_nowait()
+            except queue.Empty:
+                return
+
+    def configurar(self, tipo, modo_index):
+        # invalida lo que está en la cola si cambió el tipo o el modo
+        with self._lock:
+            if self.config[:2] == (tipo, modo_index):
+                return
+            self.config = (tipo, modo_index, self.config[2] + 1)
+        self._vaciar()
+
+    def obtener(self, tipo, modo_index):
+        # devuelve (tri, known, unknown); si la cola está vacía se genera acá mismo
+        self.configurar(tipo, modo_index)
+        gen = self.config[2]
+        while True:
+            try:
+                g, tri, known, unknown = self.cola.get_nowait()
+            except queue.Empty:
+                break
+            if g == gen:
+                return tri, known, unknown
+        tri = self.generar(tipo)
+        known, unknown = seleccionar_medidas(tri, modo_index)
+        return tri, known, unknown
+
+    def cerrar(self):
+        self._parar.set()
+        self._hilo.join(timeout=1)
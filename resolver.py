@@ -0,0 +1,184 @@
+"""
+resolver.py
+Resuelve triángulos a partir de las medidas conocidas (SSS, SAS, ASA, AAS, SSA)
+con ley de senos y ley de cosenos, para uno solo o para lotes completos.
+En el caso SSA ambiguo se devuelven las dos soluciones.
+clasificar_ssa dice por lotes cuántas soluciones tiene cada SSA (modo 1: a, b, A),
+y filtro_ssa / generar_ssa lo usan para generar solo casos únicos o ambiguos.
+"""
+
+import math
+
+from triangulos import CLAVES, generar_triangulos, law_of_cosines_angle
+
+LADOS = ['a','b','c']
+ANGULOS = ['A','B','C']
+RAD = math.pi / 180
+EPS = 1e-9
+# margen para sen(Y) ~ 1: los datos vienen redondeados a 6 decimales, así que un
+# triángulo rectángulo puede dar sen(Y) apenas mayor que 1 o dos soluciones casi iguales
+TOL_SEN = 1e-6
+
+# --------------------------
+# Planes por caso
+# --------------------------
+# Cada plan recibe una fila con los valores conocidos en el orden de CLAVES
+# y devuelve una tupla de soluciones; cada solución es (a, b, c, A, B, C).
+def _plan_sss(lados):
+    def resolver(fila):
+        s = fila[:3]
+        x, y, z = sorted(s)
+        if x <= 0 or x + y <= z:
+            return ()
+        ang = [law_of_cosines_angle(s[(i+1) % 3], s[(i+2) % 3], s[i]) for i in range(3)]
+        return ((*s, *ang),)
+    return resolver
+
+def _plan_angulos(lados, angulos):
+    # ASA / AAS: el ángulo que falta sale de la suma 180, los lados por ley de senos
+    i = lados[0]
+    n_lados = len(lados)
+    def resolver(fila):
+        ang = [None, None, None]
+        for j, v in zip(angulos, fila[n_lados:]):
+            ang[j] = v
+        if len(angulos) == 2:
+            falta = 3 - angulos[0] - angulos[1]
+            ang[falta] = 180 - ang[angulos[0]] - ang[angulos[1]]
+        if min(ang) <= 0:
+            return ()
+        k = fila[0] / math.sin(ang[i]*RAD)
+        return ((*(k*math.sin(x*RAD) for x in ang), *ang),)
+    return resolver
+
+def _plan_sas(lados, angulo):
+    # el ángulo conocido está entre los dos lados: ley de cosenos para el tercer lado
+    def resolver(fila):
+        x, y, Z = fila
+        if not 0 < Z < 180:
+            return ()
+        s = [None, None, None]
+        s[lados[0]], s[lados[1]] = x, y
+        s[angulo] = math.sqrt(max(0.0, x*x + y*y - 2*x*y*math.cos(Z*RAD)))
+        ang = [law_of_cosines_angle(s[(i+1) % 3], s[(i+2) % 3], s[i]) for i in range(3)]
+        ang[angulo] = Z
+        return ((*s, *ang),)
+    return resolver
+
+def _plan_ssa(lados, angulo):
+    # lado x opuesto al ángulo conocido X, lado y con ángulo Y por ley de senos;
+    # puede haber 0, 1 o 2 triángulos
+    j = lados[1] if lados[0] == angulo else lados[0]
+    z_i = 3 - angulo - j
+    pos_x = lados.index(angulo)
+    def resolver(fila):
+        x, y, X = fila[pos_x], fila[1 - pos_x], fila[2]
+        if not 0 < X < 180 or x <= 0:
+            return ()
+        sinY = y * math.sin(X*RAD) / x
+        if sinY > 1 + TOL_SEN:
+            return ()
+        Y1 = math.degrees(math.asin(min(1.0, sinY)))
+        candidatos = [Y1]
+        if sinY < 1 - TOL_SEN:
+            candidatos.append(180 - Y1)
+        soluciones = []
+        k = x / math.sin(X*RAD)
+        for Y in candidatos:
+            Z = 180 - X - Y
+            if Z <= EPS:
+                continue
+            s, ang = [None]*3, [None]*3
+            s[angulo], s[j], s[z_i] = x, y, k*math.sin(Z*RAD)
+            ang[angulo], ang[j], ang[z_i] = X, Y, Z
+            soluciones.append((*s, *ang))
+        return tuple(soluciones)
+    return resolver
+
+def plan_para(claves):
+    lados = [i for i, k in enumerate(LADOS) if k in claves]
+    angulos = [i for i, k in enumerate(ANGULOS) if k in claves]
+    if len(lados) == 3:
+        return _plan_sss(lados)
+    if lados and len(angulos) >= 2:
+        return _plan_angulos(lados, angulos)
+    if len(lados) == 2 and len(angulos) == 1:
+        # el ángulo incluido es el opuesto al lado que falta
+        if angulos[0] not in lados:
+            return _plan_sas(lados, angulos[0])
+        return _plan_ssa(lados, angulos[0])
+    raise ValueError(f"datos insuficientes para resolver: {sorted(claves)}")
+
+# --------------------------
+# API
+# --------------------------
+def resolver_triangulo(known):
+    # devuelve una lista con 0, 1 o 2 triángulos (dicts con las seis medidas)
+    claves = [k for k in CLAVES if k in known]
+    fila = tuple(known[k] for k in claves)
+    return [dict(zip(CLAVES, sol)) for sol in plan_para(claves)(fila)]
+
+def resolver_lote(conocidas):
+    # conocidas: {"a": [...], "b": [...], "A": [...]} (mismas claves para todo el lote)
+    # devuelve (cuantas, sol1, sol2): cuántas soluciones tiene cada fila y dos dicts
+    # de columnas con las soluciones; None donde no hay solución
+    claves = [k for k in CLAVES if k in conocidas]
+    resolver = plan_para(claves)
+    resultados = list(map(resolver, zip(*(conocidas[k] for k in claves))))
+
+    vacia = (None,)*6
+    cuantas = [len(r) for r in resultados]
+    primera = [r[0] if r else vacia for r in resultados]
+    segunda = [r[1] if len(r) > 1 else vacia for r in resultados]
+    sol1 = dict(zip(CLAVES, map(list, zip(*primera)))) if primera else {k: [] for k in CLAVES}
+    sol2 = dict(zip(CLAVES, map(list, zip(*segunda)))) if segunda else {k: [] for k in CLAVES}
+    return cuantas, sol1, sol2
+
+# --------------------------
+# Clasificación SSA
+# --------------------------
+SSA_SIN_SOLUCION, SSA_UNICA, SSA_AMBIGUA = 0, 1, 2
+CASOS_SSA = {"sin_solucion": SSA_SIN_SOLUCION, "unica": SSA_UNICA, "ambigua": SSA_AMBIGUA}
+BLOQUE = 10_000
+
+def clasificar_ssa(x, y, X):
+    # x, y, X: columnas con el lado opuesto al ángulo conocido, el otro lado y el ángulo
+    # (modo 1: a, b, A); devuelve cuántas soluciones daría _plan_ssa en cada fila,
+    # con las mismas tolerancias pero sin armar los triángulos
+    sin, asin, grados = math.sin, math.asin, 180 / math.pi
+    salida = []
+    agregar = salida.append
+    for xi, yi, Xi in zip(x, y, X):
+        if not 0 < Xi < 180 or xi <= 0:
+            agregar(SSA_SIN_SOLUCION)
+            continue
+        sinY = yi * sin(Xi*RAD) / xi
+        if sinY > 1 + TOL_SEN:
+            agregar(SSA_SIN_SOLUCION)
+        elif sinY >= 1 - TOL_SEN:
+            agregar(SSA_UNICA if 90 - Xi > EPS else SSA_SIN_SOLUCION)
+        else:
+            Y = asin(sinY) * grados
+            # Y y 180 - Y: cada uno vale si deja un tercer ángulo positivo
+            agregar((180 - Xi - Y > EPS) + (Y - Xi > EPS))
+    return salida
+
+def filtro_ssa(caso):
+    # devuelve f(cols) -> cols con solo las filas cuyo SSA de modo 1 es del caso pedido
+    caso = CASOS_SSA.get(caso, caso)
+    def filtrar(cols):
+        quedan = [c == caso for c in clasificar_ssa(cols['a'], cols['b'], cols['A'])]
+        return {k: [v for v, q in zip(col, quedan) if q] for k, col in cols.items()}
+    return filtrar
+
+def generar_ssa(n, caso="unica", tipo="aleatorio", scale=1.0, rng=None, bloque=BLOQUE):
+    # como generar_triangulos pero solo con ejercicios de modo 1 del caso pedido
+    filtrar = filtro_ssa(caso)
+    cols = {k: [] for k in CLAVES}
+    while len(cols['a']) < n:
+        trozo = filtrar(generar_triangulos(bloque, tipo, scale, rng))
+        if not trozo['a']:
+            raise ValueError(f"'{tipo}' no da casos SSA '{caso}'")
+        for k in CLAVES:
+            cols[k].extend(trozo[k])
+    return {k: col[:n] for k, col in cols.items()}
@@ -0,0 +1,343 @@
+"""
+servidor.py
+Servicio HTTP/JSON con asyncio para practicar desde el navegador: cada alumno
+tiene una sesión en memoria con su ejercicio actual (solo el ID de 16 bytes de
+ejercicios.py; el triángulo se regenera cuando hace falta).
+
+Endpoints (POST, cuerpo y respuesta en JSON):
+    /generar    {"sesion"?, "tipo"?, "modo_index"?} -> ejercicio nuevo (crea la sesión si no hay)
+    /pista      {"sesion"}                          -> estrategias como en mostrar_pista
+    /verificar  {"sesion", "respuestas": {k: texto}} -> estado por medida, como verificar_respuestas
+    /calificar  {"reales": {...}, "respuestas": {...}} -> calificar_lote, en otro proceso
+
+Uso:
+    python servidor.py --puerto 8080 [--historial intentos.db]
+"""
+
+import argparse, asyncio, json, multiprocessing, secrets, time
+from concurrent.futures import ProcessPoolExecutor
+
+from calificar import calificar_lote
+from ejercicios import ejercicio_desde_id, id_a_texto, leer_id, nuevo_id
+from historial import Historial
+from triangulos import MODOS, TIPOS, TOLERANCIAS, comprobar_respuesta, estrategia
+
+MAX_CUERPO = 1 << 20        # 1 MiB
+TTL_SESION = 2 * 60 * 60    # segundos sin uso hasta que se borra la sesión
+MAX_SESIONES = 100_000
+
+class ErrorPedido(Exception):
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+# --------------------------
+# Sesiones
+# --------------------------
+class Sesion:
+    __slots__ = ("id_ejercicio", "uso", "intentos", "correctos")
+
+    def __init__(self):
+        self.id_ejercicio = None
+        self.uso = time.monotonic()
+        self.intentos = 0
+        self.correctos = 0
+
+class Sesiones:
+    def __init__(self, ttl=TTL_SESION, maximo=MAX_SESIONES):
+        self.ttl = ttl
+        self.maximo = maximo
+        self.datos = {}   # token -> Sesion, en orden de último uso
+
+    def nueva(self):
+        if len(self.datos) >= self.maximo:
+            self.limpiar()
+            if len(self.datos) >= self.maximo:
+                # se descarta la que lleva más tiempo sin usarse
+                del self.datos[next(iter(self.datos))]
+        token = secrets.token_urlsafe(16)
+        self.datos[token] = Sesion()
+        return token
+
+    def obtener(self, token):
+        s = self.datos.pop(token, None)
+        if s is None:
+            raise ErrorPedido(404, "sesión inexistente o vencida")
+        s.uso = time.monotonic()
+        self.datos[token] = s   # vuelve al final: el dict queda ordenado por uso
+        return s
+
+    def limpiar(self):
+        limite = time.monotonic() - self.ttl
+        for token in list(self.datos):
+            if self.datos[token].uso >= limite:
+                break
+            del self.datos[token]
+
+# --------------------------
+# Lógica de los endpoints
+# --------------------------
+def pistas(known, modo_index):
+    # misma pista que mostrar_pista; la estrategia sale de TABLA_MODOS
+    salida = []
+    datos = ", ".join(sorted(known))
+    salida.append(f"Datos revelados: {datos if datos else 'ninguno'}.")
+    salida.append(estrategia(modo_index))
+    if 'a' in known and 'A' in known:
+        salida.append(f"Tip: a = {known['a']:.3f}, A = {known['A']:.2f}°. Usa a/sin(A) = b/sin(B).")
+    return salida
+
+def _ejercicio(sesion):
+    if sesion.id_ejercicio is None:
+        raise ErrorPedido(409, "la sesión no tiene ejercicio: llamar antes a /generar")
+    return ejercicio_desde_id(sesion.id_ejercicio)
+
+# --------------------------
+# Validación de pedidos: lo que llega mal es 400, no un 500 con un repr
+# --------------------------
+def _numero(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+def _token(pedido, obligatorio=True):
+    token = pedido.get("sesion")
+    if token is None and not obligatorio:
+        return None
+    if not isinstance(token, str) or not token:
+        raise ErrorPedido(400, "'sesion' tiene que ser un texto")
+    return token
+
+def _columnas(nombre, datos, n=None):
+    # {medida: lista} con medidas de TOLERANCIAS y todas las listas del mismo largo
+    if not isinstance(datos, dict):
+        raise ErrorPedido(400, f"'{nombre}' tiene que ser un objeto {{medida: lista}}")
+    for k, col in datos.items():
+        if k not in TOLERANCIAS:
+            raise ErrorPedido(400, f"'{nombre}': medida desconocida: {k}")
+        if not isinstance(col, list):
+            raise ErrorPedido(400, f"'{nombre}.{k}' tiene que ser una lista")
+        if n is None:
+            n = len(col)
+        elif len(col) != n:
+            raise ErrorPedido(400, f"'{nombre}.{k}': se esperaban {n} valores")
+    return n
+
+def _validar_calificar(pedido):
+    reales, respuestas = pedido.get("reales"), pedido.get("respuestas")
+    if reales is None or respuestas is None:
+        raise ErrorPedido(400, "faltan 'reales' o 'respuestas'")
+    n = _columnas("reales", reales)
+    _columnas("respuestas", respuestas, n)
+    for k, col in reales.items():
+        if not all(_numero(v) for v in col):
+            raise ErrorPedido(400, f"'reales.{k}' tiene que tener solo números")
+    for k, col in respuestas.items():
+        if k not in reales:
+            raise ErrorPedido(400, f"'respuestas.{k}' no tiene valores en 'reales'")
+        if not all(v is None or isinstance(v, str) or _numero(v) for v in col):
+            raise ErrorPedido(400, f"'respuestas.{k}': cada valor es texto, número o null")
+    tolerancias = pedido.get("tolerancias") or {}
+    if not isinstance(tolerancias, dict):
+        raise ErrorPedido(400, "'tolerancias' tiene que ser un objeto {medida: [absoluta, relativa]}")
+    for k, v in tolerancias.items():
+        if k not in TOLERANCIAS:
+            raise ErrorPedido(400, f"'tolerancias': medida desconocida: {k}")
+        if not isinstance(v, list) or len(v) != 2 or not all(_numero(x) for x in v):
+            raise ErrorPedido(400, f"'tolerancias.{k}' tiene que ser [absoluta, relativa]")
+    return reales, respuestas, {k: tuple(v) for k, v in tolerancias.items()}
+
+class Servicio:
+    def __init__(self, sesiones=None, procesos=None, historial=None):
+        self.sesiones = sesiones or Sesiones()
+        # historial.Historial: cada /verificar se encola ahí sin esperar al disco
+        self.historial = historial
+        # calificar por lotes es CPU puro: va a otros procesos para no frenar el loop.
+        # spawn y no fork: los procesos arrancan con el primer /calificar, con el
+        # servidor ya escuchando, y con fork heredarían el socket de escucha y los de
+        # los clientes (writer.close() ya no cerraría esas conexiones)
+        self.pool = ProcessPoolExecutor(max_workers=procesos,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        self.barrido = None
+
+    async def generar(self, pedido):
+        tipo = pedido.get("tipo", "aleatorio")
+        modo_index = pedido.get("modo_index", 1)
+        if tipo not in TIPOS:
+            raise ErrorPedido(400, f"tipo desconocido: {tipo}")
+        # bool es subclase de int: true no es un modo
+        if (not isinstance(modo_index, int) or isinstance(modo_index, bool)
+                or not 0 <= modo_index < len(MODOS)):
+            raise ErrorPedido(400, f"modo_index fuera de rango: {modo_index}")
+        token = _token(pedido, obligatorio=False) or self.sesiones.nueva()
+        sesion = self.sesiones.obtener(token)
+        sesion.id_ejercicio = nuevo_id(tipo, modo_index)
+        _, known, unknown = ejercicio_desde_id(sesion.id_ejercicio)
+        return {"sesion": token, "id": id_a_texto(sesion.id_ejercicio),
+                "tipo": tipo, "modo_index": modo_index, "known": known, "unknown": unknown}
+
+    async def pista(self, pedido):
+        sesion = self.sesiones.obtener(_token(pedido))
+        _, known, _ = _ejercicio(sesion)
+        return {"pistas": pistas(known, leer_id(sesion.id_ejercicio)[2])}
+
+    async def verificar(self, pedido):
+        token = _token(pedido)
+        respuestas = pedido.get("respuestas") or {}
+        if not isinstance(respuestas, dict):
+            raise ErrorPedido(400, "'respuestas' tiene que ser un objeto {medida: texto}")
+        sesion = self.sesiones.obtener(token)
+        tri, known, unknown = _ejercicio(sesion)
+        resultados, textos = {}, {}
+        correctos = 0
+        for k in unknown:
+            r = respuestas.get(k)
+            textos[k] = "" if r is None else str(r)   # null en el JSON = vacía
+            estado, val = comprobar_respuesta(textos[k], tri[k], *TOLERANCIAS[k])
+            resultados[k] = {"estado": estado, "valor": val}
+            if estado == "correcto":
+                correctos += 1
+            elif estado == "incorrecto":
+                resultados[k]["real"] = tri[k]
+        if self.historial:
+            _, tipo, modo_index, _ = leer_id(sesion.id_ejercicio)
+            self.historial.registrar(tri, known, {k: r["estado"] for k, r in resultados.items()},
+                                     textos, token, sesion.id_ejercicio,
+                                     tipo, modo_index)
+        sesion.intentos += 1
+        if unknown and correctos == len(unknown):
+            sesion.correctos += 1
+        return {"resultados": resultados, "correctos": correctos, "total": len(unknown),
+                "perfecto": correctos == len(unknown),
+                "sesion": {"intentos": sesion.intentos, "perfectos": sesion.correctos}}
+
+    async def calificar(self, pedido):
+        reales, respuestas, tolerancias = _validar_calificar(pedido)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, calificar_lote, reales, respuestas,
+                                          tolerancias)
+
+    def rutas(self):
+        return {"/generar": self.generar, "/pista": self.pista,
+                "/verificar": self.verificar, "/calificar": self.calificar}
+
+    def cerrar(self):
+        if self.barrido:
+            self.barrido.cancel()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        if self.historial:
+            self.historial.cerrar()
+
+# --------------------------
+# HTTP mínimo sobre asyncio
+# --------------------------
+RAZONES = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+def _respuesta(estado, cuerpo, seguir=True):
+    datos = json.dumps(cuerpo, ensure_ascii=False).encode()
+    cabecera = (f"HTTP/1.1 {estado} {RAZONES[estado]}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(datos)}\r\n"
+                f"Connection: {'keep-alive' if seguir else 'close'}\r\n\r\n")
+    return cabecera.encode() + datos
+
+async def _leer_pedido(reader):
+    # devuelve (método, ruta, cabeceras, cuerpo) o None si el cliente cerró
+    linea = await reader.readline()
+    if not linea:
+        return None
+    try:
+        metodo, ruta, _ = linea.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise ErrorPedido(400, "línea de pedido inválida")
+    cabeceras = {}
+    while True:
+        linea = await reader.readline()
+        if linea in (b"\r\n", b"\n", b""):
+            break
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        cabeceras[nombre.strip().lower()] = valor.strip()
+    try:
+        largo = int(cabeceras.get("content-length", 0) or 0)
+    except ValueError:
+        raise ErrorPedido(400, "Content-Length inválido")
+    if largo > MAX_CUERPO:
+        raise ErrorPedido(413, "cuerpo demasiado grande")
+    cuerpo = await reader.readexactly(largo) if largo else b""
+    return metodo, ruta.split("?", 1)[0], cabeceras, cuerpo
+
+async def _atender(servicio, reader, writer):
+    rutas = servicio.rutas()
+    try:
+        while True:
+            # si el pedido no se pudo leer entero la conexión no se puede seguir usando
+            seguir = False
+            try:
+                pedido = await _leer_pedido(reader)
+                if pedido is None:
+                    break
+                metodo, ruta, cabeceras, cuerpo = pedido
+                seguir = cabeceras.get("connection", "").lower() != "close"
+                if ruta not in rutas:
+                    raise ErrorPedido(404, f"ruta desconocida: {ruta}")
+                if metodo != "POST":
+                    raise ErrorPedido(405, "solo POST")
+                try:
+                    datos = json.loads(cuerpo or b"{}")
+                except ValueError:
+                    raise ErrorPedido(400, "JSON inválido")
+                if not isinstance(datos, dict):
+                    raise ErrorPedido(400, "se espera un objeto JSON")
+                writer.write(_respuesta(200, await rutas[ruta](datos), seguir))
+            except ErrorPedido as e:
+                writer.write(_respuesta(e.estado, {"error": str(e)}, seguir))
+            except (ConnectionError, asyncio.IncompleteReadError):
+                raise
+            except Exception as e:
+                seguir = False
+                writer.write(_respuesta(500, {"error": repr(e)}, seguir))
+            await writer.drain()
+            if not seguir:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def _barrer(sesiones, cada=60):
+    while True:
+        await asyncio.sleep(cada)
+        sesiones.limpiar()
+
+async def iniciar(host="127.0.0.1", puerto=8080, servicio=None):
+    # devuelve (servidor, servicio) ya escuchando; puerto=0 elige uno libre
+    servicio = servicio or Servicio()
+    servidor = await asyncio.start_server(
+        lambda r, w: _atender(servicio, r, w), host, puerto, backlog=4096)
+    servicio.barrido = asyncio.create_task(_barrer(servicio.sesiones))
+    return servidor, servicio
+
+async def _principal(host, puerto, procesos, ruta_historial):
+    historial = Historial(ruta_historial) if ruta_historial else None
+    servidor, servicio = await iniciar(host, puerto, Servicio(procesos=procesos,
+                                                             historial=historial))
+    print(f"escuchando en http://{host}:{servidor.sockets[0].getsockname()[1]}")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servicio.cerrar()
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Servicio HTTP/JSON de ejercicios de triángulos.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--puerto", type=int, default=8080)
+    p.add_argument("--procesos", type=int, default=None, help="procesos para /calificar")
+    p.add_argument("--historial", default=None, help="base SQLite donde guardar los intentos")
+    args = p.parse_args(argv)
+    try:
+        asyncio.run(_principal(args.host, args.puerto, args.procesos, args.historial))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
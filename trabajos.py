@@ -0,0 +1,174 @@
+"""
+trabajos.py
+Trabajos largos (exportar una hoja, construir un banco, ...) fuera del hilo de Tk.
+La función del trabajo recibe avance(hechos, total): con eso informa el progreso
+y, si se pidió cancelar, avance lanza Cancelado y el trabajo se corta ahí.
+La interfaz no espera a nadie: consulta hechos/total/terminado con master.after.
+
+en_proceso=True corre la función en otro proceso (spawn, sin heredar Tk ni los
+hilos de la app), así el trabajo no compite por el GIL con el dibujo; la función
+y sus argumentos tienen que poder mandarse con pickle.
+"""
+
+import multiprocessing, queue, threading
+
+class Cancelado(Exception):
+    pass
+
+def _en_proceso(fn, args, kwargs, cola, cancelar):
+    def avance(hechos, total=None):
+        if cancelar.is_set():
+            raise Cancelado()
+        cola.put(("avance", hechos, total))
+    try:
+        cola.put(("fin", fn(*args, avance=avance, **kwargs)))
+    except Cancelado:
+        cola.put(("cancelado",))
+    except Exception as e:
+        cola.put(("error", repr(e)))
+
+class Trabajo:
+    def __init__(self, fn, *args, en_proceso=False, **kwargs):
+        self.hechos = 0
+        self.total = None
+        self.resultado = None
+        self.error = None
+        self.cancelado = False
+        self._cancelar = threading.Event()
+        self._fin = threading.Event()
+        self._proceso = None
+        destino = self._correr_proceso if en_proceso else self._correr_hilo
+        self._hilo = threading.Thread(target=destino, args=(fn, args, kwargs), daemon=True)
+        self._hilo.start()
+
+    @property
+    def terminado(self):
+        return self._fin.is_set()
+
+    def fraccion(self):
+        return self.hechos / self.total if self.total else 0.0
+
+    def cancelar(self):
+        self._cancelar.set()
+
+    def esperar(self, timeout=None):
+        return self._fin.wait(timeout)
+
+    def _avance(self, hechos, total=None):
+        if self._cancelar.is_set():
+            raise Cancelado()
+        self.hechos = hechos
+        if total is not None:
+            self.total = total
+
+    def _correr_hilo(self, fn, args, kwargs):
+        try:
+            self.resultado = fn(*args, avance=self._avance, **kwargs)
+        except Cancelado:
+            self.cancelado = True
+        except Exception as e:
+            self.error = repr(e)
+        finally:
+            self._fin.set()
+
+    def _correr_proceso(self, fn, args, kwargs):
+        ctx = multiprocessing.get_context("spawn")
+        cola, cancelar = ctx.Queue(), ctx.Event()
+        self._proceso = ctx.Process(target=_en_proceso, args=(fn, args, kwargs, cola, cancelar),
+                                    daemon=True)
+        self._proceso.start()
+        try:
+            while True:
+                if self._cancelar.is_set():
+                    cancelar.set()
+                try:
+                    msj = cola.get(timeout=0.1)
+                except queue.Empty:
+                    if not self._proceso.is_alive() and cola.empty():
+                        self.error = f"el proceso terminó con código {self._proceso.exitcode}"
+                        break
+                    continue
+                if msj[0] == "avance":
+                    self.hechos = msj[1]
+                    if msj[2] is not None:
+                        self.total = msj[2]
+                    continue
+                if msj[0] == "fin":
+                    self.resultado = msj[1]
+                elif msj[0] == "cancelado":
+                    self.cancelado = True
+                else:
+                    self.error = msj[1]
+                break
+            self._proceso.join()
+        finally:
+            self._fin.set()
+
+# --------------------------
+# Seguir un trabajo desde la interfaz
+# --------------------------
+SONDEO_MS = 100          # cada cuánto se mira el progreso
+EJERCICIOS_HOJA = 10_000 # tamaño de hoja sugerido
+
+class PanelTrabajo:
+    # barra de progreso, etiqueta de estado y botón Cancelar de las apps; recibe los
+    # widgets ya creados. tkinter y exportar se importan dentro de exportar_hoja para
+    # que Trabajo siga sirviendo sin interfaz
+    def __init__(self, master, progreso, estado, cancelar_btn, sondeo_ms=SONDEO_MS):
+        self.master = master
+        self.progreso = progreso
+        self.estado = estado
+        self.cancelar_btn = cancelar_btn
+        self.sondeo_ms = sondeo_ms
+        self.trabajo = None
+        self.nombre = ""
+        cancelar_btn.configure(command=self.cancelar)
+
+    @property
+    def ocupado(self):
+        return self.trabajo is not None and not self.trabajo.terminado
+
+    def exportar_hoja(self, tipo, modo_index):
+        from tkinter import filedialog, simpledialog
+        import exportar
+        if self.ocupado:
+            return
+        ruta = filedialog.asksaveasfilename(parent=self.master, defaultextension=".jsonl",
+                                            filetypes=[("JSON Lines", "*.jsonl"), ("CSV", "*.csv")])
+        if not ruta:
+            return
+        n = simpledialog.askinteger("Exportar hoja", "Cantidad de ejercicios:", parent=self.master,
+                                    initialvalue=EJERCICIOS_HOJA, minvalue=1)
+        if not n:
+            return
+        formato = "csv" if ruta.endswith(".csv") else "jsonl"
+        self.iniciar(f"Exportar {n} ejercicios", exportar.exportar_hoja, ruta, n,
+                     tipo, modo_index, formato)
+
+    def iniciar(self, nombre, fn, *args):
+        # fn(*args, avance=...) corre en otro proceso; acá solo se consulta su estado
+        # cada sondeo_ms con master.after, así el canvas sigue respondiendo
+        self.trabajo = Trabajo(fn, *args, en_proceso=True)
+        self.nombre = nombre
+        self.cancelar_btn.configure(state="normal")
+        self._sondear()
+
+    def cancelar(self):
+        if self.trabajo:
+            self.trabajo.cancelar()
+
+    def _sondear(self):
+        t = self.trabajo
+        self.progreso.configure(value=100 * t.fraccion())
+        if not t.terminado:
+            self.estado.configure(text=f"{self.nombre}: {t.hechos}/{t.total or '?'}")
+            self.master.after(self.sondeo_ms, self._sondear)
+            return
+        self.cancelar_btn.configure(state="disabled")
+        if t.cancelado:
+            texto = f"{self.nombre}: cancelado"
+        elif t.error:
+            texto = f"{self.nombre}: error {t.error}"
+        else:
+            texto = f"{self.nombre}: listo ({t.resultado})"
+        self.estado.configure(text=texto)
@@ -0,0 +1,324 @@
+"""
+triangulos.py
+Núcleo sin interfaz gráfica: generación de triángulos (uno o por lotes),
+selección de medidas según el modo y corrección de respuestas.
+Lo usan las apps de tkinter (xd.py, xd2.py, xd3.py) y los procesos por lotes;
+no debe importar tkinter.
+"""
+
+import os, random, math
+from bisect import bisect_right
+
+# CLAVES se define una sola vez en compacto (que no puede importar este módulo)
+from compacto import CLAVES, Triangulo
+
+RAD = math.pi / 180
+
+# Límites por tipo: (A_min, A_max, B_min, B_max, C_min, C_max)
+# C = 180 - A - B tiene que quedar estrictamente entre C_min y C_max
+# (mismas reglas que random_angles_for dentro de generar_triangulo).
+LIMITES = {
+    "agudo":     (20, 70, 20, 80, 0, 90),
+    "obtuso":    (91, 140, 10, 60, 0, 180),
+    "aleatorio": (20, 100, 20, 120, 5, 180),
+}
+
+TIPOS = ["aleatorio", "rectangulo", "agudo", "obtuso"]
+
+# --------------------------
+# Utilidades matemáticas
+# --------------------------
+def law_of_cosines_angle(a, b, c):
+    den = 2*a*b
+    if den == 0:
+        return None
+    val = max(-1.0, min(1.0, (a*a + b*b - c*c) / den))
+    return math.degrees(math.acos(val))
+
+# --------------------------
+# Muestreo exacto de ángulos
+# --------------------------
+# La región válida de (A, B) es el rectángulo de límites cortado por
+# c_min < 180 - A - B < c_max, o sea un polígono convexo. Se parte en
+# triángulos (abanico) y se sortea uno según su área y un punto uniforme
+# dentro de él: cada sorteo sale válido, sin bucle de rechazo.
+# recortar, poligono_region y abanico son públicas: cobertura.py las usa para
+# partir la región en celdas.
+def recortar(poligono, dentro, corte):
+    salida = []
+    for i, p in enumerate(poligono):
+        q = poligono[i - 1]
+        if dentro(p):
+            if not dentro(q):
+                salida.append(corte(q, p))
+            salida.append(p)
+        elif dentro(q):
+            salida.append(corte(q, p))
+    return salida
+
+def _corte_suma(s):
+    # punto del segmento pq donde A + B == s
+    def corte(p, q):
+        t = (s - p[0] - p[1]) / ((q[0] + q[1]) - (p[0] + p[1]))
+        return (p[0] + t*(q[0] - p[0]), p[1] + t*(q[1] - p[1]))
+    return corte
+
+def poligono_region(tipo):
+    a0, a1, b0, b1, c0, c1 = LIMITES[tipo]
+    poligono = [(a0, b0), (a1, b0), (a1, b1), (a0, b1)]
+    # A + B > 180 - c_max   y   A + B < 180 - c_min
+    poligono = recortar(poligono, lambda p: p[0] + p[1] >= 180 - c1, _corte_suma(180 - c1))
+    poligono = recortar(poligono, lambda p: p[0] + p[1] <= 180 - c0, _corte_suma(180 - c0))
+    return poligono
+
+def abanico(poligono):
+    # cada triángulo se guarda como (x0, y0, dx1, dy1, dx2, dy2): vértice y aristas;
+    # devuelve (triángulos, pesos acumulados por área, área total)
+    if len(poligono) < 3:
+        return [], [], 0.0
+    (x0, y0) = poligono[0]
+    triangulos, acumulado, total = [], [], 0.0
+    for (x1, y1), (x2, y2) in zip(poligono[1:], poligono[2:]):
+        dx1, dy1, dx2, dy2 = x1 - x0, y1 - y0, x2 - x0, y2 - y0
+        area = abs(dx1*dy2 - dx2*dy1) / 2
+        if area > 0:
+            total += area
+            triangulos.append((x0, y0, dx1, dy1, dx2, dy2))
+            acumulado.append(total)
+    if total == 0:
+        return [], [], 0.0
+    return triangulos, [x / total for x in acumulado], total
+
+def _region(tipo):
+    triangulos, acumulado, _ = abanico(poligono_region(tipo))
+    return triangulos, acumulado
+
+REGIONES = {tipo: _region(tipo) for tipo in LIMITES}
+
+def _punto_en(tri, r1, r2):
+    x0, y0, dx1, dy1, dx2, dy2 = tri
+    s = math.sqrt(r1)
+    w1, w2 = s*(1 - r2), s*r2
+    return x0 + w1*dx1 + w2*dx2, y0 + w1*dy1 + w2*dy2
+
+def muestrear_angulos(tipo="aleatorio", rng=None):
+    if rng is None:
+        rng = random
+    u = rng.random
+    if tipo == "rectangulo":
+        A = 20 + 50*u()
+        return A, 90.0, 90.0 - A
+
+    triangulos, acumulado = REGIONES.get(tipo, REGIONES["aleatorio"])
+    tri = triangulos[bisect_right(acumulado, u(), hi=len(acumulado) - 1)]
+    A, B = _punto_en(tri, u(), u())
+    return A, B, 180 - A - B
+
+# --------------------------
+# Generador de triángulos
+# --------------------------
+def generar_triangulo(tipo="aleatorio", scale=1.0, rng=None):
+    # rng: random.Random propio; si no se pasa se usa el estado global de random
+    if rng is None:
+        rng = random
+    A, B, C = muestrear_angulos(tipo, rng)
+
+    a = rng.uniform(4, 12) * scale
+    sinA = math.sin(math.radians(A))
+    if sinA == 0:
+        return generar_triangulo(tipo, scale, rng)
+    k = a / sinA
+    b = k * math.sin(math.radians(B))
+    c = k * math.sin(math.radians(C))
+
+    return Triangulo(round(a, 6), round(b, 6), round(c, 6),
+                     round(A, 6), round(B, 6), round(C, 6))
+
+# --------------------------
+# Generador por lotes
+# --------------------------
+def _angulos_lote(n, tipo, rng):
+    u = rng.random
+    if tipo == "rectangulo":
+        A = [20 + 50*u() for _ in range(n)]
+        return A, [90.0]*n, [90.0 - x for x in A]
+
+    triangulos, acumulado = REGIONES.get(tipo, REGIONES["aleatorio"])
+    ultimo = len(acumulado) - 1
+    sqrt = math.sqrt
+    A, B = [], []
+    agregar_A, agregar_B = A.append, B.append
+    # mismo cálculo que _punto_en, desarmado para no crear tuplas por triángulo
+    for _ in range(n):
+        x0, y0, dx1, dy1, dx2, dy2 = triangulos[bisect_right(acumulado, u(), 0, ultimo)]
+        s = sqrt(u())
+        r = u()
+        w1, w2 = s*(1 - r), s*r
+        agregar_A(x0 + w1*dx1 + w2*dx2)
+        agregar_B(y0 + w1*dy1 + w2*dy2)
+    return A, B, [180 - x - y for x, y in zip(A, B)]
+
+def generar_triangulos(n, tipo="aleatorio", scale=1.0, rng=None):
+    # devuelve columnas (listas) en vez de un dict por triángulo:
+    # {"a": [...], "b": [...], "c": [...], "A": [...], "B": [...], "C": [...]}
+    if rng is None:
+        rng = random
+    A, B, C = _angulos_lote(n, tipo, rng)
+    return lados_desde_angulos(A, B, C, scale, rng)
+
+def lados_desde_angulos(A, B, C, scale, rng):
+    # lados para ángulos ya sorteados; mismas columnas que generar_triangulos
+    n = len(A)
+    u = rng.random
+    sin = math.sin
+    a = [(4 + 8*u()) * scale for _ in range(n)]
+    # ley del seno: k = a/sen(A), b = k*sen(B), c = k*sen(C)
+    k = [x / sin(y*RAD) for x, y in zip(a, A)]
+    b = [ki * sin(y*RAD) for ki, y in zip(k, B)]
+    c = [ki * sin(y*RAD) for ki, y in zip(k, C)]
+
+    return {
+        "a": [round(x, 6) for x in a],
+        "b": [round(x, 6) for x in b],
+        "c": [round(x, 6) for x in c],
+        "A": [round(x, 6) for x in A],
+        "B": [round(x, 6) for x in B],
+        "C": [round(x, 6) for x in C],
+    }
+
+# --------------------------
+# Modos y selección de medidas
+# --------------------------
+# Cada modo: (máscara de medidas conocidas, etiqueta, estrategia para la pista).
+# La máscara va en el orden de CLAVES: a=1, b=2, c=4, A=8, B=16, C=32.
+# Con TRIANGULOS_MODOS=ruta.json la tabla se lee de ese archivo (ver cargar_modos).
+TODAS = 0b111111
+TABLA_MODOS = [
+    (0b000011, "2 lados (SAS) — oculto el resto",
+     "Estrategia: tienes 2 lados (a y b). Usa Ley de Cosenos."),
+    (0b001011, "2 lados + 1 ángulo (ASA/AAS)",
+     "Estrategia: 2 lados + 1 ángulo. Ley de Cosenos o Ley de Senos según corresponda."),
+    (0b110001, "1 lado + 2 ángulos (AAS)",
+     "Estrategia: 1 lado + 2 ángulos. Saca el ángulo faltante y usa Ley de Senos."),
+    (0b000111, "3 lados (SSS)",
+     "Estrategia: con 3 lados usa Ley de Cosenos."),
+    (TODAS, "mostrar todo",
+     "Modo mostrar todo."),
+]
+VARIABLE_MODOS = "TRIANGULOS_MODOS"
+
+# derivados de TABLA_MODOS; usar_modos los cambia en el lugar, así quien hizo
+# `from triangulos import MODOS` ve la tabla nueva
+MODOS = []          # etiquetas, lo que muestran los menús
+_SELECCION = {}     # índice -> (claves conocidas, claves ocultas)
+_TODO = (CLAVES, ())
+
+def mascara(claves):
+    # conjunto de medidas -> bits en el orden de CLAVES
+    return sum(1 << CLAVES.index(k) for k in claves)
+
+def claves_de(mascara):
+    return [k for i, k in enumerate(CLAVES) if mascara >> i & 1]
+
+def usar_modos(tabla):
+    tabla = list(tabla)
+    if not tabla:
+        raise ValueError("la tabla de modos está vacía")
+    for i, (m, _, _) in enumerate(tabla):
+        if not 0 <= m <= TODAS:
+            raise ValueError(f"modo {i}: máscara fuera de rango: {m}")
+    TABLA_MODOS[:] = tabla
+    MODOS[:] = [etiqueta for _, etiqueta, _ in tabla]
+    _SELECCION.clear()
+    _SELECCION.update((i, (tuple(claves_de(m)), tuple(claves_de(TODAS & ~m))))
+                      for i, (m, _, _) in enumerate(tabla))
+
+def cargar_modos(ruta):
+    # JSON: [{"conocidas": ["a", "b", "A"], "etiqueta": "...", "estrategia": "..."}, ...]
+    # ("mascara": 11 en lugar de "conocidas" también vale)
+    import json
+    with open(ruta, encoding="utf-8") as f:
+        datos = json.load(f)
+    tabla = []
+    for i, d in enumerate(datos):
+        if "conocidas" in d:
+            sobran = set(d["conocidas"]) - set(CLAVES)
+            if sobran:
+                raise ValueError(f"{ruta}: modo {i}: medidas desconocidas {sorted(sobran)}")
+            m = mascara(d["conocidas"])
+        elif "mascara" in d:
+            m = int(d["mascara"])
+        else:
+            raise ValueError(f"{ruta}: modo {i}: falta 'conocidas' o 'mascara'")
+        if "etiqueta" not in d:
+            raise ValueError(f"{ruta}: modo {i}: falta 'etiqueta'")
+        tabla.append((m, d["etiqueta"], d.get("estrategia", "")))
+    return tabla
+
+usar_modos(TABLA_MODOS)
+if os.environ.get(VARIABLE_MODOS):
+    usar_modos(cargar_modos(os.environ[VARIABLE_MODOS]))
+
+def mascara_modo(modo_index):
+    # un modo fuera de la tabla muestra todo (como el else de antes)
+    return TABLA_MODOS[modo_index][0] if 0 <= modo_index < len(TABLA_MODOS) else TODAS
+
+def estrategia(modo_index):
+    return TABLA_MODOS[modo_index][2] if 0 <= modo_index < len(TABLA_MODOS) else "Modo mostrar todo."
+
+def seleccionar_medidas(tri, modo_index):
+    conocidas, ocultas = _SELECCION.get(modo_index, _TODO)
+    # bucle y no comprensión: en 3.11 la comprensión crea una función por llamada
+    known = {}
+    for k in conocidas:
+        known[k] = tri[k]
+    return known, list(ocultas)
+
+def seleccionar_lote(cols, modo):
+    # seleccionar_medidas para un lote en columnas (como generar_triangulos), sin
+    # armar un dict por triángulo. modo: un índice para todo el lote o una lista
+    # con uno por fila (p. ej. cols["modo"] de cobertura.py).
+    # Devuelve (conocidas, ocultas): clave -> columna, con None donde la medida no
+    # va. Con un solo modo las columnas son las mismas listas de cols (no se
+    # copian) y las vacías son una sola lista compartida: no modificarlas.
+    n = len(cols['a'])
+    if isinstance(modo, int):
+        m = mascara_modo(modo)
+        vacia = [None] * n
+        conocidas = {k: cols[k] if m >> i & 1 else vacia for i, k in enumerate(CLAVES)}
+        ocultas = {k: vacia if m >> i & 1 else cols[k] for i, k in enumerate(CLAVES)}
+        return conocidas, ocultas
+    por_modo = [m for m, _, _ in TABLA_MODOS]
+    fuera = len(por_modo)
+    mascaras = [por_modo[x] if 0 <= x < fuera else TODAS for x in modo]
+    conocidas, ocultas = {}, {}
+    for i, k in enumerate(CLAVES):
+        bit = 1 << i
+        col = cols[k]
+        conocidas[k] = [v if m & bit else None for v, m in zip(col, mascaras)]
+        ocultas[k] = [None if m & bit else v for v, m in zip(col, mascaras)]
+    return conocidas, ocultas
+
+# --------------------------
+# Corrección de respuestas
+# --------------------------
+TOLERANCIA = 0.1
+# tolerancia (absoluta, relativa) por medida; una respuesta es correcta si
+# |valor - real| < max(absoluta, relativa * |real|)
+TOLERANCIAS = {k: (TOLERANCIA, 0.0) for k in CLAVES}
+
+def dentro_de_tolerancia(val, real, tol=TOLERANCIA, tol_rel=0.0):
+    return abs(val - real) < max(tol, tol_rel * abs(real))
+
+def comprobar_respuesta(entrada, real, tol=TOLERANCIA, tol_rel=0.0):
+    # devuelve (estado, valor) con estado "vacio", "invalido", "correcto" o "incorrecto"
+    entrada = entrada.strip()
+    if entrada == "":
+        return "vacio", None
+    try:
+        val = float(entrada)
+    except ValueError:
+        return "invalido", None
+    if dentro_de_tolerancia(val, real, tol, tol_rel):
+        return "correcto", val
+    return "incorrecto", val
@@ -2,143 +2,66 @@
 triangulos_estudio.py
 Generador de triángulos aleatorios para practicar trigonometría.
 Interfaz con tkinter que dibuja el triángulo y muestra solo algunas medidas.
-Botones: Nuevo triángulo, Mostrar solución, Pista, Tipo, Modo.
+Botones: Nuevo triángulo, Mostrar solución, Pista, Tipo, Modo, Exportar hoja (en otro proceso).
+F2: tiempos por método encima del canvas (solo con TRIANGULOS_MEDIR=1).
+TRIANGULOS_BANCO=banco.bin: los triángulos salen de un banco precalculado (banco.py).
+TRIANGULOS_SIN_REPETIR=1: no se muestra dos veces casi el mismo triángulo (duplicados.py).
 """
 
+import atexit
 import tkinter as tk
 from tkinter import ttk
-import random, math
-
-# --------------------------
-# Utilidades matemáticas
-# --------------------------
-def law_of_cosines_angle(a, b, c):
-    den = 2*a*b
-    if den == 0:
-        return None
-    val = max(-1.0, min(1.0, (a*a + b*b - c*c) / den))
-    return math.degrees(math.acos(val))
-
-# --------------------------
-# Generador de triángulos
-# --------------------------
-def generar_triangulo(tipo="aleatorio", scale=1.0):
-    def random_angles_for(tipo):
-        if tipo == "rectangulo":
-            A = random.uniform(20,70)
-            B = 90.0
-            C = 90.0 - A
-        elif tipo == "agudo":
-            A = random.uniform(20,70)
-            B = random.uniform(20, 80)
-            C = 180 - A - B
-            if C <= 0 or C >= 90:
-                return None
-        elif tipo == "obtuso":
-            A = random.uniform(91,140)
-            B = random.uniform(10, 60)
-            C = 180 - A - B
-            if C <= 0:
-                return None
-        else:
-            A = random.uniform(20, 100)
-            B = random.uniform(20, 120)
-            C = 180 - A - B
-            if C <= 5:
-                return None
-        return A, B, C
-
-    angles = None
-    for _ in range(30):
-        angles = random_angles_for(tipo)
-        if angles:
-            break
-    if not angles:
-        angles = (50.0, 60.0, 70.0)
-    A, B, C = angles
-
-    a = random.uniform(4, 12) * scale
-    sinA = math.sin(math.radians(A))
-    if sinA == 0:
-        return generar_triangulo(tipo, scale)
-    k = a / sinA
-    b = k * math.sin(math.radians(B))
-    c = k * math.sin(math.radians(C))
-
-    return {
-        "a": round(a, 6),
-        "b": round(b, 6),
-        "c": round(c, 6),
-        "A": round(A, 6),
-        "B": round(B, 6),
-        "C": round(C, 6)
-    }
-
-# --------------------------
-# Modos y selección de medidas
-# --------------------------
-MODOS = [
-    "2 lados (SAS) — oculto el resto",
-    "2 lados + 1 ángulo (ASA/AAS)",
-    "1 lado + 2 ángulos (AAS)",
-    "3 lados (SSS)",
-    "mostrar todo"
-]
-
-def seleccionar_medidas(tri, modo_index):
-    keys = ['a','b','c','A','B','C']
-    known = {}
-    unknown = []
-
-    if modo_index == 0:
-        known['a'] = tri['a']
-        known['b'] = tri['b']
-        unknown = ['c','A','B','C']
-    elif modo_index == 1:
-        known['a'] = tri['a']
-        known['b'] = tri['b']
-        known['A'] = tri['A']
-        unknown = ['c','B','C']
-    elif modo_index == 2:
-        known['a'] = tri['a']
-        known['B'] = tri['B']
-        known['C'] = tri['C']
-        unknown = ['b','c','A']
-    elif modo_index == 3:
-        known['a'] = tri['a']
-        known['b'] = tri['b']
-        known['c'] = tri['c']
-        unknown = ['A','B','C']
-    else:
-        for k in keys:
-            known[k] = tri[k]
-        unknown = []
-
-    return known, unknown
+from disposicion import vertices
+from precarga import Precarga
+from medicion import Estadisticas, medidor_para
+from duplicados import INTENTOS, IndiceEjercicios, sin_repetir_desde_entorno
+from banco import banco_desde_entorno
+from trabajos import PanelTrabajo
+from triangulos import TIPOS, MODOS, estrategia, generar_triangulo, seleccionar_medidas
 
 # --------------------------
 # Interfaz Tkinter
 # --------------------------
+
 class TriangulosApp:
-    def __init__(self, master):
+    def __init__(self, master, precarga=True, medir=None, sin_repetir=False, banco=None):
         self.master = master
+        # medición de tiempos (opcional); se envuelve antes de que botones y eventos
+        # tomen los métodos, y apagada no se toca nada
+        self.medidor = medidor_para(medir)
+        if self.medidor:
+            self.medidor.instrumentar(self)
+            atexit.register(self.medidor.volcar)
         master.title("Triángulos - Sistema de estudio")
         self.canvas_w = 520
         self.canvas_h = 420
 
-        self.tipo = tk.StringVar(value="aleatorio")
+        # de dónde salen los triángulos: un banco precalculado (banco.py) o generar_triangulo;
+        # con banco el menú ofrece solo los tipos que tiene y el generador hace en el
+        # momento los que falten
+        self.tipos = (banco.tipos() if banco else None) or TIPOS
+        self.tipo = tk.StringVar(value="aleatorio" if "aleatorio" in self.tipos else self.tipos[0])
         self.modo_index = tk.IntVar(value=1)
-        self.tri = generar_triangulo(self.tipo.get())
+        self.generar = banco.generador() if banco else generar_triangulo
+        self.tri = self.generar(self.tipo.get())
         self.known, self.unknown = seleccionar_medidas(self.tri, self.modo_index.get())
+        # triángulos ya mostrados en la sesión, para no repetir casi el mismo
+        self.indice = IndiceEjercicios() if sin_repetir else None
+        self.agotados = set()   # tipos sin triángulos nuevos: ya no se reintenta
+        if self.indice:
+            self.indice.agregar(self.tri)
         self.show_solution = False
         self.show_hints = False
+        # triángulos siguientes preparados en segundo plano (None = generar en el momento)
+        self.precarga = (Precarga(self.tipo.get(), self.modo_index.get(), generar=self.generar)
+                         if precarga else None)
 
         control_frame = ttk.Frame(master, padding=8)
         control_frame.pack(side="top", fill="x")
 
         ttk.Label(control_frame, text="Tipo:").grid(row=0,column=0,sticky="w")
         tipo_menu = ttk.Combobox(control_frame,
-                                 values=["aleatorio","rectangulo","agudo","obtuso"],
+                                 values=self.tipos,
                                  textvariable=self.tipo, state="readonly", width=12)
         tipo_menu.grid(row=0,column=1, padx=4)
         tipo_menu.bind("<<ComboboxSelected>>", lambda e: self.nuevo_triangulo())
@@ -152,9 +75,27 @@ class TriangulosApp:
         ttk.Button(control_frame, text="Nuevo triángulo", command=self.nuevo_triangulo).grid(row=1,column=0, pady=6)
         ttk.Button(control_frame, text="Mostrar solución", command=self.toggle_solution).grid(row=1,column=1, pady=6)
         ttk.Button(control_frame, text="Pista", command=self.mostrar_pista).grid(row=1,column=2, pady=6)
+        # trabajos largos: exportar una hoja sin congelar la ventana
+        ttk.Button(control_frame, text="Exportar hoja…",
+                   command=lambda: self.panel_trabajo.exportar_hoja(self.tipo.get(), self.modo_index.get())
+                   ).grid(row=1,column=3, pady=6, sticky="w")
+        trabajo_frame = ttk.Frame(control_frame)
+        trabajo_frame.grid(row=1, column=4, sticky="w")
+        self.progreso = ttk.Progressbar(trabajo_frame, length=140, maximum=100)
+        self.progreso.pack(side="left", padx=4)
+        self.cancelar_btn = ttk.Button(trabajo_frame, text="Cancelar", state="disabled")
+        self.cancelar_btn.pack(side="left")
+        self.estado_trabajo = ttk.Label(control_frame, text="")
+        self.estado_trabajo.grid(row=2, column=0, columnspan=5, sticky="w")
+        self.panel_trabajo = PanelTrabajo(master, self.progreso, self.estado_trabajo, self.cancelar_btn)
 
         self.canvas = tk.Canvas(master, width=self.canvas_w, height=self.canvas_h, bg="white")
         self.canvas.pack(padx=8, pady=8)
+        # items del canvas: se crean en el primer dibujo y después solo se actualizan
+        self.items = {}
+        self.textos = {}
+        # F2: tabla de tiempos encima del canvas (solo con medición)
+        self.estadisticas = Estadisticas(master, self.canvas, self.medidor) if self.medidor else None
 
         self.info = tk.Text(master, height=10, width=80)
         self.info.pack(padx=8, pady=(0,8))
@@ -170,11 +111,28 @@ class TriangulosApp:
         if idx >= 0:
             self.modo_index.set(idx)
             self.known, self.unknown = seleccionar_medidas(self.tri, self.modo_index.get())
-            self.draw()
+            if self.precarga:
+                self.precarga.configurar(self.tipo.get(), idx)
+            self.draw(geometria=False)
 
     def nuevo_triangulo(self):
-        self.tri = generar_triangulo(self.tipo.get())
-        self.known, self.unknown = seleccionar_medidas(self.tri, self.modo_index.get())
+        # con sin_repetir se descartan los casi iguales a uno ya mostrado; si un tipo
+        # se queda sin nuevos (pasa pronto con "rectangulo", que tiene un solo ángulo
+        # libre) se usa el último y el tipo queda agotado: desde ahí no se reintenta,
+        # así cada clic no paga INTENTOS sorteos ni vacía la precarga
+        tipo = self.tipo.get()
+        repetir = self.indice is None or tipo in self.agotados
+        for _ in range(1 if repetir else INTENTOS):
+            if self.precarga:
+                self.tri, self.known, self.unknown = self.precarga.obtener(tipo,
+                                                                           self.modo_index.get())
+            else:
+                self.tri = self.generar(tipo)
+                self.known, self.unknown = seleccionar_medidas(self.tri, self.modo_index.get())
+            if repetir or self.indice.agregar(self.tri):
+                break
+        else:
+            self.agotados.add(tipo)
         self.show_solution = False
         self.show_hints = False
         self.modo_menu.current(self.modo_index.get())
@@ -214,7 +172,7 @@ class TriangulosApp:
         if self.show_hints:
             self.show_solution = False
         self.known, self.unknown = seleccionar_medidas(self.tri, self.modo_index.get())
-        self.draw()
+        self.draw(geometria=False)
 
     def mostrar_pista(self):
         pistas = []
@@ -222,17 +180,7 @@ class TriangulosApp:
         datos = ", ".join(sorted(self.known.keys()))
         pistas.append(f"Datos revelados: {datos if datos else 'ninguno'}.")
 
-        idx = self.modo_index.get()
-        if idx == 0:
-            pistas.append("Estrategia: tienes 2 lados (a y b). Usa Ley de Cosenos.")
-        elif idx == 1:
-            pistas.append("Estrategia: 2 lados + 1 ángulo. Ley de Cosenos o Ley de Senos según corresponda.")
-        elif idx == 2:
-            pistas.append("Estrategia: 1 lado + 2 ángulos. Saca el ángulo faltante y usa Ley de Senos.")
-        elif idx == 3:
-            pistas.append("Estrategia: con 3 lados usa Ley de Cosenos.")
-        else:
-            pistas.append("Modo mostrar todo.")
+        pistas.append(estrategia(self.modo_index.get()))
 
         if 'a' in self.known and 'A' in self.known:
             pistas.append(f"Tip: a = {self.known['a']:.3f}, A = {self.known['A']:.2f}°. Usa a/sin(A) = b/sin(B).")
@@ -247,79 +195,54 @@ class TriangulosApp:
     # ----------------------
     # Dibujado
     # ----------------------
-    def draw(self):
-        self.canvas.delete("all")
-        self._draw_triangle()
-        self._draw_labels()
+    def draw(self, geometria=True):
+        # geometria=False: el triángulo no cambió (p. ej. cambio de modo), solo los textos
+        if geometria or not self.items:
+            self._draw_triangle()
+        self._draw_labels(mover=geometria)
         self._update_info_panel()
 
     def _draw_triangle(self):
-
-        # lados (según tu convención: a = BC, b = AC, c = AB)
-        a = float(self.tri['a'])  # BC
-        b = float(self.tri['b'])  # AC
-        c = float(self.tri['c'])  # AB
-
-        margin = 40
-        max_side = max(a, b, c)
-        if max_side == 0:
-            escala = 1.0
-        else:
-            escala = min((self.canvas_w - 2*margin) / max_side,
-                        (self.canvas_h - 2*margin) / max_side) * 0.9
-
-        # Longitudes escaladas
-        a_len = a * escala   # distancia BC en píxeles
-        b_len = b * escala   # distancia AC en píxeles (radio desde C hasta A)
-        c_len = c * escala   # distancia AB en píxeles (radio desde B hasta A)
-
-        # Colocamos la base BC horizontal, centrada hacia abajo
-        Bx = (self.canvas_w - a_len) / 2
-        By = self.canvas_h - margin
-        Cx = Bx + a_len
-        Cy = By
-
-        # proteger contra a_len == 0
-        d = a_len if a_len != 0 else 1e-6
-
-        # Intersección de círculos centrados en B y C con radios c_len y b_len
-        # x_proj = distancia desde B a la proyección de A sobre BC (en el eje BC)
-        x_proj = (c_len*c_len - b_len*b_len + d*d) / (2*d)
-
-        tmp = c_len*c_len - x_proj*x_proj
-        if tmp < 0:
-            # ajuste numérico (evita NaN)
-            tmp = 0.0
-        y_alt = math.sqrt(tmp)
-
-        # Coordenadas de A (colocamos A hacia arriba de la base)
-        Ax = Bx + x_proj
-        Ay = By - y_alt
-
-        # fallback si sale infinito/NaN
-        if not (math.isfinite(Ax) and math.isfinite(Ay)):
-            Ax = Bx + d/2
-            Ay = By - max(40, max(b_len, c_len)/2)
+        # lados (a = BC, b = AC, c = AB); la ubicación de los vértices la calcula disposicion
+        a = float(self.tri['a'])
+        b = float(self.tri['b'])
+        c = float(self.tri['c'])
+        Ax, Ay, Bx, By, Cx, Cy = vertices(a, b, c, self.canvas_w, self.canvas_h)
 
         # guardar puntos (consistentes con labels: A arriba, B izquierda, C derecha)
         self.pts = {'A': (Ax, Ay), 'B': (Bx, By), 'C': (Cx, Cy)}
 
         # dibujar triángulo
-        self.canvas.create_polygon(
-            self.pts['B'][0], self.pts['B'][1],
-            self.pts['C'][0], self.pts['C'][1],
-            self.pts['A'][0], self.pts['A'][1],
-            fill="#f0f7ff", outline="black", width=2
-        )
-
-
-
-    def _draw_labels(self):
+        self._item('triangulo', self.canvas.create_polygon,
+                   (self.pts['B'][0], self.pts['B'][1],
+                    self.pts['C'][0], self.pts['C'][1],
+                    self.pts['A'][0], self.pts['A'][1]),
+                   fill="#f0f7ff", outline="black", width=2)
+
+    def _item(self, clave, crear, coords, mover=True, texto=None, **opciones):
+        # crea el item la primera vez; las siguientes solo mueve y cambia el texto si hace falta
+        item = self.items.get(clave)
+        if item is None:
+            if texto is not None:
+                opciones['text'] = texto
+                self.textos[clave] = texto
+            self.items[clave] = crear(*coords, **opciones)
+            return
+        if mover:
+            self.canvas.coords(item, *coords)
+        if texto is not None and self.textos.get(clave) != texto:
+            self.canvas.itemconfigure(item, text=texto)
+            self.textos[clave] = texto
+
+
+    def _draw_labels(self, mover=True):
         for label, (x, y) in self.pts.items():
-            self.canvas.create_oval(x-4, y-4, x+4, y+4, fill="black")
+            self._item(('punto', label), self.canvas.create_oval,
+                       (x-4, y-4, x+4, y+4), mover, fill="black")
             tx = x + 12 if x + 60 < self.canvas_w else x - 12
             ty = y - 8 if y - 20 > 0 else y + 12
-            self.canvas.create_text(tx, ty, text=label, font=("Arial", 12, "bold"))
+            self._item(('vertice', label), self.canvas.create_text,
+                       (tx, ty), mover, label, font=("Arial", 12, "bold"))
 
         def midpoint(p1, p2):
             return ((p1[0]+p2[0])/2, (p1[1]+p2[1])/2)
@@ -336,14 +259,16 @@ class TriangulosApp:
             mx, my = midpoint(p1, p2)
             txt = f"{side} = {self.known[side]:.3f}" if side in self.known else f"{side} = ?"
             ty = my - 10 if my > 20 else my + 10
-            self.canvas.create_text(mx, ty, text=txt, font=("Arial", 10, "italic"))
+            self._item(('lado', side), self.canvas.create_text,
+                       (mx, ty), mover, txt, font=("Arial", 10, "italic"))
 
         for ang in ['A','B','C']:
             x, y = self.pts[ang]
             txt = f"{ang} = {self.known[ang]:.2f}°" if ang in self.known else f"{ang} = ?"
             tx = x - 15 if x > 30 else x + 15
             ty = y - 20 if y > 30 else y + 15
-            self.canvas.create_text(tx, ty, text=txt, font=("Arial", 9))
+            self._item(('angulo', ang), self.canvas.create_text,
+                       (tx, ty), mover, txt, font=("Arial", 9))
 
     def _update_info_panel(self):
         self.info.configure(state='normal')
@@ -373,5 +298,5 @@ class TriangulosApp:
 # --------------------------
 if __name__ == "__main__":
     root = tk.Tk()
-    app = TriangulosApp(root)
+    app = TriangulosApp(root, banco=banco_desde_entorno(), sin_repetir=sin_repetir_desde_entorno())
     root.mainloop()
@@ -1,145 +1,79 @@
 """
 Generador de triángulos aleatorios para practicar trigonometría.
 Interfaz con tkinter que dibuja el triángulo y muestra solo algunas medidas.
-Botones: Nuevo triángulo, Mostrar solución, Pista, Tipo, Modo.
+Botones: Nuevo triángulo, Mostrar solución, Pista, Tipo, Modo, Exportar hoja (en otro proceso).
+F2: tiempos por método encima del canvas (solo con TRIANGULOS_MEDIR=1).
+TRIANGULOS_BANCO=banco.bin: los triángulos salen de un banco precalculado (banco.py).
+TRIANGULOS_SIN_REPETIR=1: no se muestra dos veces casi el mismo triángulo (duplicados.py).
+TRIANGULOS_HISTORIAL=intentos.db: cada intento corregido se guarda en SQLite (historial.py).
 """
 
+import atexit
 import tkinter as tk
 from tkinter import ttk
-import random, math
-
-# --------------------------
-# Utilidades matemáticas
-# --------------------------
-def law_of_cosines_angle(a, b, c):
-    den = 2*a*b
-    if den == 0:
-        return None
-    val = max(-1.0, min(1.0, (a*a + b*b - c*c) / den))
-    return math.degrees(math.acos(val))
-
-# --------------------------
-# Generador de triángulos
-# --------------------------
-def generar_triangulo(tipo="aleatorio", scale=1.0):
-    def random_angles_for(tipo):
-        if tipo == "rectangulo":
-            A = random.uniform(20,70)
-            B = 90.0
-            C = 90.0 - A
-        elif tipo == "agudo":
-            A = random.uniform(20,70)
-            B = random.uniform(20, 80)
-            C = 180 - A - B
-            if C <= 0 or C >= 90:
-                return None
-        elif tipo == "obtuso":
-            A = random.uniform(91,140)
-            B = random.uniform(10, 60)
-            C = 180 - A - B
-            if C <= 0:
-                return None
-        else:
-            A = random.uniform(20, 100)
-            B = random.uniform(20, 120)
-            C = 180 - A - B
-            if C <= 5:
-                return None
-        return A, B, C
-
-    angles = None
-    for _ in range(30):
-        angles = random_angles_for(tipo)
-        if angles:
-            break
-    if not angles:
-        angles = (50.0, 60.0, 70.0)
-    A, B, C = angles
-
-    a = random.uniform(4, 12) * scale
-    sinA = math.sin(math.radians(A))
-    if sinA == 0:
-        return generar_triangulo(tipo, scale)
-    k = a / sinA
-    b = k * math.sin(math.radians(B))
-    c = k * math.sin(math.radians(C))
-
-    return {
-        "a": round(a, 6),
-        "b": round(b, 6),
-        "c": round(c, 6),
-        "A": round(A, 6),
-        "B": round(B, 6),
-        "C": round(C, 6)
-    }
-
-# --------------------------
-# Modos y selección de medidas
-# --------------------------
-MODOS = [
-    "2 lados (SAS) — oculto el resto",
-    "2 lados + 1 ángulo (ASA/AAS)",
-    "1 lado + 2 ángulos (AAS)",
-    "3 lados (SSS)",
-    "mostrar todo"
-]
-
-def seleccionar_medidas(tri, modo_index):
-    keys = ['a','b','c','A','B','C']
-    known = {}
-    unknown = []
-
-    if modo_index == 0:
-        known['a'] = tri['a']
-        known['b'] = tri['b']
-        unknown = ['c','A','B','C']
-    elif modo_index == 1:
-        known['a'] = tri['a']
-        known['b'] = tri['b']
-        known['A'] = tri['A']
-        unknown = ['c','B','C']
-    elif modo_index == 2:
-        known['a'] = tri['a']
-        known['B'] = tri['B']
-        known['C'] = tri['C']
-        unknown = ['b','c','A']
-    elif modo_index == 3:
-        known['a'] = tri['a']
-        known['b'] = tri['b']
-        known['c'] = tri['c']
-        unknown = ['A','B','C']
-    else:
-        for k in keys:
-            known[k] = tri[k]
-        unknown = []
-
-    return known, unknown
+from disposicion import vertices
+from collections import deque
+from precarga import Precarga
+from medicion import Estadisticas, medidor_para
+from duplicados import INTENTOS, IndiceEjercicios, sin_repetir_desde_entorno
+from banco import banco_desde_entorno
+from trabajos import PanelTrabajo
+from historial import historial_desde_entorno
+from triangulos import TIPOS, MODOS, CLAVES, TOLERANCIAS, estrategia, generar_triangulo, seleccionar_medidas, comprobar_respuesta
 
 # --------------------------
 # Interfaz Tkinter
 # --------------------------
+# líneas como máximo en el log de pistas/resultados del panel
+MAX_LINEAS_LOG = 200
+
 class TriangulosApp:
-    def __init__(self, master):
+    def __init__(self, master, max_lineas_log=MAX_LINEAS_LOG, precarga=True, medir=None, sin_repetir=False, banco=None, historial=None):
         self.master = master
+        # medición de tiempos (opcional); se envuelve antes de que botones y eventos
+        # tomen los métodos, y apagada no se toca nada
+        self.medidor = medidor_para(medir)
+        if self.medidor:
+            self.medidor.instrumentar(self)
+            atexit.register(self.medidor.volcar)
         master.title("Triángulos - Sistema de estudio")
         self.canvas_w = 520
         self.canvas_h = 420
 
-        self.tipo = tk.StringVar(value="aleatorio")
+        # de dónde salen los triángulos: un banco precalculado (banco.py) o generar_triangulo;
+        # con banco el menú ofrece solo los tipos que tiene y el generador hace en el
+        # momento los que falten
+        self.tipos = (banco.tipos() if banco else None) or TIPOS
+        self.tipo = tk.StringVar(value="aleatorio" if "aleatorio" in self.tipos else self.tipos[0])
         self.modo_index = tk.IntVar(value=1)
-        self.tri = generar_triangulo(self.tipo.get())
+        self.generar = banco.generador() if banco else generar_triangulo
+        self.tri = self.generar(self.tipo.get())
         self.known, self.unknown = seleccionar_medidas(self.tri, self.modo_index.get())
+        # triángulos ya mostrados en la sesión, para no repetir casi el mismo
+        self.indice = IndiceEjercicios() if sin_repetir else None
+        self.agotados = set()   # tipos sin triángulos nuevos: ya no se reintenta
+        if self.indice:
+            self.indice.agregar(self.tri)
         self.show_solution = False
         self.show_hints = False
-
-        self.inputs = {}
+        # triángulos siguientes preparados en segundo plano (None = generar en el momento)
+        self.precarga = (Precarga(self.tipo.get(), self.modo_index.get(), generar=self.generar)
+                         if precarga else None)
+
+        self.inputs = {}          # Entry de inputs_frame (las que corrige verificar_respuestas)
+        self.inputs_panel = {}    # Entry de las filas dentro del panel de texto
+        # historial.Historial donde se guarda cada intento corregido (None = no se guarda)
+        self.historial = historial
+        self.max_lineas_log = max_lineas_log
+        self.secciones_log = deque()
+        self.lineas_log = 0
 
         control_frame = ttk.Frame(master, padding=8)
         control_frame.pack(side="top", fill="x")
 
         ttk.Label(control_frame, text="Tipo:").grid(row=0,column=0,sticky="w")
         tipo_menu = ttk.Combobox(control_frame,
-                                 values=["aleatorio","rectangulo","agudo","obtuso"],
+                                 values=self.tipos,
                                  textvariable=self.tipo, state="readonly", width=12)
         tipo_menu.grid(row=0,column=1, padx=4)
         tipo_menu.bind("<<ComboboxSelected>>", lambda e: self.nuevo_triangulo())
@@ -153,18 +87,40 @@ class TriangulosApp:
         ttk.Button(control_frame, text="Nuevo triángulo", command=self.nuevo_triangulo).grid(row=1,column=0, pady=6)
         ttk.Button(control_frame, text="Mostrar solución", command=self.toggle_solution).grid(row=1,column=1, pady=6)
         ttk.Button(control_frame, text="Pista", command=self.mostrar_pista).grid(row=1,column=2, pady=6)
+        # trabajos largos: exportar una hoja sin congelar la ventana
+        ttk.Button(control_frame, text="Exportar hoja…",
+                   command=lambda: self.panel_trabajo.exportar_hoja(self.tipo.get(), self.modo_index.get())
+                   ).grid(row=1,column=3, pady=6, sticky="w")
+        trabajo_frame = ttk.Frame(control_frame)
+        trabajo_frame.grid(row=1, column=4, sticky="w")
+        self.progreso = ttk.Progressbar(trabajo_frame, length=140, maximum=100)
+        self.progreso.pack(side="left", padx=4)
+        self.cancelar_btn = ttk.Button(trabajo_frame, text="Cancelar", state="disabled")
+        self.cancelar_btn.pack(side="left")
+        self.estado_trabajo = ttk.Label(control_frame, text="")
+        self.estado_trabajo.grid(row=2, column=0, columnspan=5, sticky="w")
+        self.panel_trabajo = PanelTrabajo(master, self.progreso, self.estado_trabajo, self.cancelar_btn)
 
         self.canvas = tk.Canvas(master, width=self.canvas_w, height=self.canvas_h, bg="white")
         self.canvas.pack(padx=8, pady=8)
+        # items del canvas: se crean en el primer dibujo y después solo se actualizan
+        self.items = {}
+        self.textos = {}
+        # F2: tabla de tiempos encima del canvas (solo con medición)
+        self.estadisticas = Estadisticas(master, self.canvas, self.medidor) if self.medidor else None
 
         self.inputs_frame = ttk.Frame(master, padding=6)
         self.inputs_frame.pack()
 
         ttk.Button(self.inputs_frame, text="Verificar respuestas",
                    command=self.verificar_respuestas).pack(pady=6)
+        self.sin_ocultas = ttk.Label(self.inputs_frame, text="No hay valores ocultos.")
+        self.filas_inputs_frame = []
+        self.filas_visibles = 0
 
         self.info = tk.Text(master, height=10, width=80)
         self.info.pack(padx=8, pady=(0,8))
+        self._crear_filas_inputs()
         self.info.configure(state='disabled')
 
         self.draw()
@@ -173,63 +129,80 @@ class TriangulosApp:
     # Crear entradas
     # --------------------------
     def crear_inputs(self):
-        for widget in self.inputs_frame.winfo_children():
-            if isinstance(widget, ttk.Entry) or isinstance(widget, ttk.Label):
-                widget.destroy()
-
+        # Las filas (Label + Entry) se crean solo la primera vez que hacen falta (a lo sumo
+        # una por medida) y se reutilizan; las que sobran se ocultan con pack_forget.
         self.inputs.clear()
 
         if not self.unknown:
-            ttk.Label(self.inputs_frame, text="No hay valores ocultos.").pack()
+            self._mostrar_filas(0)
+            self.sin_ocultas.pack()
             return
-
-        for k in self.unknown:
-            ttk.Label(self.inputs_frame, text=f"{k} =").pack(anchor="w")
-            e = ttk.Entry(self.inputs_frame, width=20)
-            e.pack(anchor="w", pady=2)
+        self.sin_ocultas.pack_forget()
+
+        for i, k in enumerate(self.unknown):
+            if i == len(self.filas_inputs_frame):
+                self.filas_inputs_frame.append((ttk.Label(self.inputs_frame),
+                                                tk.Entry(self.inputs_frame, width=20)))
+            etiqueta, e = self.filas_inputs_frame[i]
+            etiqueta.config(text=f"{k} =")
+            # la Entry se reutiliza: se limpia como si fuera nueva
+            e.delete(0, tk.END)
+            e.config(fg=self.fg_entrada)
             self.inputs[k] = e
+        self._mostrar_filas(len(self.unknown))
+
+    def _mostrar_filas(self, n):
+        # las filas visibles siempre son las primeras n, así el orden de pack se mantiene
+        for etiqueta, e in self.filas_inputs_frame[n:self.filas_visibles]:
+            etiqueta.pack_forget()
+            e.pack_forget()
+        for etiqueta, e in self.filas_inputs_frame[self.filas_visibles:n]:
+            etiqueta.pack(anchor="w")
+            e.pack(anchor="w", pady=2)
+        self.filas_visibles = n
 
     # --------------------------
     # Verificar respuestas
     # --------------------------
     def verificar_respuestas(self):
-        if not self.unknown:
+        # solo las medidas que tienen una Entry a la vista
+        claves = [k for k in self.unknown if k in self.inputs]
+        if not claves:
             return
 
-        self.info.configure(state="normal")
-        self.info.insert(tk.END, "\n=== RESULTADOS ===\n")
+        resultados = ["\n=== RESULTADOS ===\n"]
 
         correctos = 0
-        total = len(self.unknown)
-
-        for k in self.unknown:
-            entrada = self.inputs[k].get().strip()
-            if entrada == "":
-                self.info.insert(tk.END, f"{k}: ❌ No ingresado\n")
-                continue
-
-            try:
-                val = float(entrada)
-            except:
-                self.info.insert(tk.END, f"{k}: ❌ No es un número válido\n")
-                self.inputs[k].config(fg="red")
-                continue
+        total = len(claves)
 
+        respuestas, estados = {}, {}
+        for k in claves:
             real = self.tri[k]
-
-            if abs(val - real) < 0.1:
-                self.info.insert(tk.END, f"{k}: ✔ Correcto ({val})\n")
+            respuestas[k] = self.inputs[k].get()
+            estado, val = comprobar_respuesta(respuestas[k], real, *TOLERANCIAS[k])
+            estados[k] = estado
+
+            if estado == "vacio":
+                resultados.append(f"{k}: ❌ No ingresado\n")
+            elif estado == "invalido":
+                resultados.append(f"{k}: ❌ No es un número válido\n")
+                self.inputs[k].config(fg="red")
+            elif estado == "correcto":
+                resultados.append(f"{k}: ✔ Correcto ({val})\n")
                 self.inputs[k].config(fg="green")
                 correctos += 1
             else:
-                self.info.insert(tk.END, f"{k}: ❌ Incorrecto — el valor correcto es {real}\n")
+                resultados.append(f"{k}: ❌ Incorrecto — el valor correcto es {real}\n")
                 self.inputs[k].config(fg="red")
 
+        if self.historial:
+            self.historial.registrar(self.tri, self.known, estados, respuestas,
+                                     tipo=self.tipo.get(), modo=self.modo_index.get())
+
         if correctos == total:
-            self.info.insert(tk.END, "\n🎉 ¡Perfecto! Todas las respuestas son correctas.\n")
+            resultados.append("\n🎉 ¡Perfecto! Todas las respuestas son correctas.\n")
 
-        self.info.configure(state='disabled')
-        self.info.see(tk.END)
+        self._agregar_log("".join(resultados))
 
 
     # ----------------------
@@ -238,11 +211,28 @@ class TriangulosApp:
     def modo_changed(self, event=None):
         self.modo_index.set(self.modo_menu.current())
         self.known, self.unknown = seleccionar_medidas(self.tri, self.modo_index.get())
-        self.draw()
+        if self.precarga:
+            self.precarga.configurar(self.tipo.get(), self.modo_index.get())
+        self.draw(geometria=False)
 
     def nuevo_triangulo(self):
-        self.tri = generar_triangulo(self.tipo.get())
-        self.known, self.unknown = seleccionar_medidas(self.tri, self.modo_index.get())
+        # con sin_repetir se descartan los casi iguales a uno ya mostrado; si un tipo
+        # se queda sin nuevos (pasa pronto con "rectangulo", que tiene un solo ángulo
+        # libre) se usa el último y el tipo queda agotado: desde ahí no se reintenta,
+        # así cada clic no paga INTENTOS sorteos ni vacía la precarga
+        tipo = self.tipo.get()
+        repetir = self.indice is None or tipo in self.agotados
+        for _ in range(1 if repetir else INTENTOS):
+            if self.precarga:
+                self.tri, self.known, self.unknown = self.precarga.obtener(tipo,
+                                                                           self.modo_index.get())
+            else:
+                self.tri = self.generar(tipo)
+                self.known, self.unknown = seleccionar_medidas(self.tri, self.modo_index.get())
+            if repetir or self.indice.agregar(self.tri):
+                break
+        else:
+            self.agotados.add(tipo)
         self.draw()
 
     def toggle_solution(self):
@@ -251,11 +241,14 @@ class TriangulosApp:
         self.known, self.unknown = seleccionar_medidas(self.tri, self.modo_index.get())
 
         self.info.configure(state="normal")
-        self.info.delete("1.0", tk.END)
+        self.info.delete("1.0", "slot0.first")
+        self._limpiar_log()
+        self._mostrar_filas_inputs([])
 
-        self.info.insert(tk.END, "\n=== SOLUCIÓN COMPLETA ===\n")
+        solucion = "\n=== SOLUCIÓN COMPLETA ===\n"
         for k in ['A','B','C','a','b','c']:
-            self.info.insert(tk.END, f"{k} = {self.tri[k]}\n")
+            solucion += f"{k} = {self.tri[k]}\n"
+        self.info.insert("1.0", solucion, ("encabezado",))
 
         self.info.configure(state="disabled")
 
@@ -265,72 +258,54 @@ class TriangulosApp:
         datos = ", ".join(sorted(self.known.keys()))
         pistas.append(f"Datos revelados: {datos if datos else 'ninguno'}.")
 
-        idx = self.modo_index.get()
-        if idx == 0:
-            pistas.append("Estrategia: 2 lados → Ley de Cosenos.")
-        elif idx == 1:
-            pistas.append("Estrategia: 2 lados + 1 ángulo → Ley de Senos / Cosenos.")
-        elif idx == 2:
-            pistas.append("Estrategia: 1 lado + 2 ángulos → Ley de Senos.")
-        elif idx == 3:
-            pistas.append("Estrategia: 3 lados → Ley de Cosenos.")
+        pistas.append(estrategia(self.modo_index.get()))
 
-        self.info.configure(state="normal")
-        self.info.insert(tk.END, "\n--- PISTA ---\n")
-        for p in pistas:
-            self.info.insert(tk.END, p + "\n")
-        self.info.configure(state="disabled")
+        self._agregar_log("\n--- PISTA ---\n" + "".join(p + "\n" for p in pistas))
 
     # ----------------------
     # Dibujar
     # ----------------------
-    def draw(self):
-        self.canvas.delete("all")
-        self._draw_triangle()
-        self._draw_labels()
+    def draw(self, geometria=True):
+        # geometria=False: el triángulo no cambió (cambio de modo), solo los textos
+        if geometria or not self.items:
+            self._draw_triangle()
+        self._draw_labels(mover=geometria)
         self._update_info_panel()
         self.crear_inputs()
 
     def _draw_triangle(self):
+        # lados (a = BC, b = AC, c = AB); la ubicación de los vértices la calcula disposicion
         a = float(self.tri['a'])
         b = float(self.tri['b'])
         c = float(self.tri['c'])
-
-        margin = 40
-        max_side = max(a, b, c)
-        escala = min((self.canvas_w - 2*margin) / max_side,
-                     (self.canvas_h - 2*margin) / max_side) * 0.9
-
-        a_len = a * escala
-        b_len = b * escala
-        c_len = c * escala
-
-        Bx = (self.canvas_w - a_len) / 2
-        By = self.canvas_h - margin
-        Cx = Bx + a_len
-        Cy = By
-
-        d = a_len
-        x_proj = (c_len*c_len - b_len*b_len + d*d) / (2*d)
-        tmp = c_len*c_len - x_proj*x_proj
-        if tmp < 0:
-            tmp = 0
-        y_alt = math.sqrt(tmp)
-
-        Ax = Bx + x_proj
-        Ay = By - y_alt
+        Ax, Ay, Bx, By, Cx, Cy = vertices(a, b, c, self.canvas_w, self.canvas_h)
 
         self.pts = {'A': (Ax, Ay), 'B': (Bx, By), 'C': (Cx, Cy)}
 
-        self.canvas.create_polygon(
-            Bx, By, Cx, Cy, Ax, Ay,
-            fill="#f0f7ff", outline="black", width=2
-        )
+        self._item('triangulo', self.canvas.create_polygon, (Bx, By, Cx, Cy, Ax, Ay),
+                   fill="#f0f7ff", outline="black", width=2)
+
+    def _item(self, clave, crear, coords, mover=True, texto=None, **opciones):
+        # crea el item la primera vez; las siguientes solo mueve y cambia el texto si hace falta
+        item = self.items.get(clave)
+        if item is None:
+            if texto is not None:
+                opciones['text'] = texto
+                self.textos[clave] = texto
+            self.items[clave] = crear(*coords, **opciones)
+            return
+        if mover:
+            self.canvas.coords(item, *coords)
+        if texto is not None and self.textos.get(clave) != texto:
+            self.canvas.itemconfigure(item, text=texto)
+            self.textos[clave] = texto
 
-    def _draw_labels(self):
+    def _draw_labels(self, mover=True):
         for label, (x, y) in self.pts.items():
-            self.canvas.create_oval(x-4, y-4, x+4, y+4, fill="black")
-            self.canvas.create_text(x+12, y-8, text=label, font=("Arial", 12, "bold"))
+            self._item(('punto', label), self.canvas.create_oval,
+                       (x-4, y-4, x+4, y+4), mover, fill="black")
+            self._item(('vertice', label), self.canvas.create_text,
+                       (x+12, y-8), mover, label, font=("Arial", 12, "bold"))
 
         def midpoint(p1, p2):
             return ((p1[0]+p2[0])/2, (p1[1]+p2[1])/2)
@@ -346,46 +321,111 @@ class TriangulosApp:
             p2 = self.pts[side_points[side][1]]
             mx, my = midpoint(p1, p2)
             txt = f"{side} = {self.known[side]:.3f}" if side in self.known else f"{side} = ?"
-            self.canvas.create_text(mx, my - 12, text=txt, font=("Arial", 10, "italic"))
+            self._item(('lado', side), self.canvas.create_text,
+                       (mx, my - 12), mover, txt, font=("Arial", 10, "italic"))
 
         for ang in ['A','B','C']:
             x, y = self.pts[ang]
             txt = f"{ang} = {self.known[ang]:.2f}°" if ang in self.known else f"{ang} = ?"
-            self.canvas.create_text(x - 15, y - 20, text=txt, font=("Arial", 9))
+            self._item(('angulo', ang), self.canvas.create_text,
+                       (x - 15, y - 20), mover, txt, font=("Arial", 9))
 
     def _update_info_panel(self):
         self.info.configure(state='normal')
-        self.info.delete("1.0", tk.END)
+        # se borra el encabezado (antes de las filas) y lo que quedó después de "fin";
+        # las filas con las Entry no se borran nunca
+        self.info.delete("1.0", "slot0.first")
+        self._limpiar_log()
 
-        self.info.insert(tk.END, "MEDIDAS MOSTRADAS (según modo):\n")
+        encabezado = "MEDIDAS MOSTRADAS (según modo):\n"
         for k, v in self.known.items():
-            self.info.insert(tk.END, f"  {k} = {v}\n")
+            encabezado += f"  {k} = {v}\n"
+        encabezado += "\nMEDIDAS OCULTAS:\n"
+        self.info.insert("1.0", encabezado, ("encabezado",))
 
-        self.info.insert(tk.END, "\nMEDIDAS OCULTAS:\n")
-
-        # ========= NUEVO SISTEMA DE INPUTS DENTRO DEL PANEL ==========
-        self.inputs.clear()
+        # Inputs DENTRO del panel
+        self._mostrar_filas_inputs(self.unknown)
 
-        for k in self.unknown:
-            self.info.insert(tk.END, f"  {k} = ")
-
-            e = tk.Entry(self.info, width=12, font=("Consolas", 11))
-            self.info.window_create(tk.END, window=e)
-            self.inputs[k] = e
-
-            self.info.insert(tk.END, "\n")
-        # =============================================================
+        self.info.configure(state='disabled')
 
         if self.show_hints:
-            self.info.insert(tk.END, "\n(Pista activa)\n")
+            self._agregar_log("\n(Pista activa)\n")
 
-        self.info.configure(state='disabled')
+    # ----------------------
+    # Log del panel (pistas, resultados)
+    # ----------------------
+    def _limpiar_log(self):
+        self.info.delete("fin", tk.END)
+        self.secciones_log.clear()
+        self.lineas_log = 0
+
+    def _agregar_log(self, texto):
+        # Cada sección entra con un solo insert. Si el log (lo que está después de "fin")
+        # pasa de max_lineas_log, se borran las secciones más viejas, así el costo de
+        # actualizar el panel no crece con la duración de la sesión.
+        lineas = texto.count("\n")
+        self.info.configure(state="normal")
+        self.info.insert(tk.END, texto)
+        self.secciones_log.append(lineas)
+        self.lineas_log += lineas
+        sobran = 0
+        while self.lineas_log > self.max_lineas_log and len(self.secciones_log) > 1:
+            n = self.secciones_log.popleft()
+            self.lineas_log -= n
+            sobran += n
+        if sobran:
+            self.info.delete("fin", f"fin + {sobran} lines")
+        self.info.configure(state="disabled")
+        self.info.see(tk.END)
 
+    # ----------------------
+    # Entradas reutilizables
+    # ----------------------
+    def _crear_filas_inputs(self):
+        # Una fila "  k = [Entry]" por cada medida que puede quedar oculta (a lo sumo 6).
+        # Se crean una sola vez: borrar del Text un rango con una Entry la destruye, así que
+        # las filas nunca se borran; se cambia la etiqueta y se ocultan con elide.
+        # Tags: slotN = fila completa, etiquetaN = texto "  k = ". Marca "fin" = después de las filas.
+        self.filas_inputs = []
+        for i in range(len(CLAVES)):
+            inicio = self.info.index("end-1c")
+            self.info.insert(tk.END, "  ? = ", (f"etiqueta{i}", f"slot{i}"))
+            e = tk.Entry(self.info, width=12, font=("Consolas", 11))
+            self.info.window_create(tk.END, window=e)
+            self.info.insert(tk.END, "\n", (f"slot{i}",))
+            self.info.tag_add(f"slot{i}", inicio, "end-1c")
+            self.info.tag_configure(f"slot{i}", elide=True)
+            self.filas_inputs.append([e, "  ? = ", False])
+        self.fg_entrada = self.filas_inputs[0][0].cget("fg")
+        self.info.mark_set("fin", "end-1c")
+        self.info.mark_gravity("fin", "left")
+
+    def _mostrar_filas_inputs(self, claves):
+        self.inputs_panel.clear()
+        for i, fila in enumerate(self.filas_inputs):
+            e, etiqueta, visible = fila
+            if i < len(claves):
+                k = claves[i]
+                if etiqueta != f"  {k} = ":
+                    ini = self.info.index(f"etiqueta{i}.first")
+                    self.info.delete(ini, f"etiqueta{i}.last")
+                    self.info.insert(ini, f"  {k} = ", (f"etiqueta{i}", f"slot{i}"))
+                    fila[1] = f"  {k} = "
+                # la Entry se reutiliza: se limpia como si fuera nueva
+                e.delete(0, tk.END)
+                e.config(fg=self.fg_entrada)
+                self.inputs_panel[k] = e
+            if visible != (i < len(claves)):
+                fila[2] = i < len(claves)
+                self.info.tag_configure(f"slot{i}", elide=not fila[2])
 
 # --------------------------
 # Ejecutar app
 # --------------------------
 if __name__ == "__main__":
     root = tk.Tk()
-    app = TriangulosApp(root)
+    historial = historial_desde_entorno()
+    app = TriangulosApp(root, banco=banco_desde_entorno(), sin_repetir=sin_repetir_desde_entorno(), historial=historial)
     root.mainloop()
+    if historial:
+        historial.cerrar()